@@ -0,0 +1,61 @@
+# backend/core/contract_text.py
+"""
+Contract Text Helpers
+
+Token-aware slicing of contract text for LLM prompts, so nodes send the
+clauses an amendment touches instead of an arbitrary character prefix.
+"""
+
+from typing import Dict, Iterable, List, Optional
+from functools import lru_cache
+import logging
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a cl100k token in English prose, used to cut text by characters
+# when the encoding is unavailable
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def tokenizer() -> Optional[tiktoken.Encoding]:
+    """
+    The cl100k_base encoding, or None when it cannot be loaded. tiktoken fetches
+    the BPE file on first use, so a host without network access or a warm cache
+    falls back to character-based truncation instead of failing every prompt.
+    """
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning("cl100k_base encoding unavailable, truncating by characters: %s", e)
+        return None
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Leading slice of text cut on a token boundary"""
+    encoding = tokenizer()
+    if encoding is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def split_paragraphs(contract: str) -> List[str]:
+    """Non-empty, blank-line separated paragraphs of the contract"""
+    return [p.strip() for p in contract.split("\n\n") if p.strip()]
+
+
+def clause_paragraphs(paragraphs: List[str], clauses: Iterable[str]) -> Dict[str, str]:
+    """Map each named clause to the first contract paragraph that mentions it"""
+    lowered = [paragraph.lower() for paragraph in paragraphs]
+    matches = {}
+    for clause in clauses:
+        needle = clause.replace("_", " ").lower()
+        for paragraph, text in zip(paragraphs, lowered):
+            if needle in text:
+                matches[clause] = paragraph
+                break
+    return matches
@@ -6,12 +6,52 @@ This module defines the comprehensive state structure that flows through
 the entire multi-party contract amendment workflow.
 """
 
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Any, Literal, Tuple
+from pydantic import BaseModel, Field, PrivateAttr
+from dataclasses import dataclass, field
+from collections import Counter
 from datetime import datetime, timezone
 from enum import Enum
+import hashlib
 import uuid
 
+import orjson
+
+from .contract_text import truncate_tokens, split_paragraphs, clause_paragraphs
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+# Fields that the memoized prompt fragments (serialized changes, contract
+# excerpts) are built from
+_PROMPT_SOURCE_FIELDS = frozenset({"proposed_changes", "original_contract"})
+
+
+def _fingerprint(data: Any) -> Optional[str]:
+    """Short, process-stable digest of a JSON-like payload for audit logs"""
+    if not data:
+        return None
+    if isinstance(data, bytes):
+        payload = data
+    else:
+        payload = orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+# Audit-trail fields that grow with every node run; left out of execution-log
+# input snapshots so hashing a node's input doesn't re-serialize the whole history.
+_AUDIT_FIELDS = frozenset({"execution_history", "node_outputs"})
+
+# Upper bound on state.errors so a failing workflow can't grow its
+# checkpoints without limit; error_count keeps the full total.
+MAX_ERROR_HISTORY = 20
+
 
 class AmendmentStatus(str, Enum):
     """Amendment workflow status enumeration"""
@@ -29,41 +69,60 @@ class AmendmentStatus(str, Enum):
     FAILED = "failed"
 
 
-class PartyResponse(BaseModel):
+# Closed vocabularies for the record fields below. Pydantic rejects anything
+# else when the state is rebuilt, instead of letting a typo silently fail
+# every status comparison downstream.
+PartyStatus = Literal[
+    "approved", "rejected", "requested_changes", "pending",
+    "pending_re_review", "error"
+]
+ConflictSeverity = Literal["high", "medium", "low"]
+ResolutionStatus = Literal["unresolved", "in_progress", "resolved"]
+
+
+# The per-party / per-conflict records below are slotted dataclasses rather than
+# BaseModels: they are built from trusted node code, so validating them again on
+# every construction is wasted work. Pydantic still validates them (once) when
+# the enclosing AmendmentWorkflowState is rebuilt from checkpoint data.
+
+@dataclass(slots=True)
+class PartyResponse:
     """Individual party response to amendment proposal"""
     party_id: str
     organization: str
-    status: str  # approved, rejected, requested_changes, pending
+    status: PartyStatus
     comments: Optional[str] = None
     proposed_changes: Optional[Dict[str, Any]] = None
     conditions: Optional[List[str]] = None
-    timestamp: datetime = Field(default_factory=datetime.now(timezone.utc))
+    timestamp: datetime = field(default_factory=_utcnow)
     risk_assessment: Optional[Dict[str, Any]] = None
 
 
-class ConflictInfo(BaseModel):
+@dataclass(slots=True)
+class ConflictInfo:
     """Information about detected conflicts between parties"""
-    conflict_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     conflict_type: str  # contradictory_terms, overlapping_sections, policy_violation
     description: str
     affected_parties: List[str]
     affected_clauses: List[str]
-    severity: str  # high, medium, low
+    severity: ConflictSeverity
     resolution_suggestions: Optional[List[str]] = None
-    resolution_status: str = "unresolved"  # unresolved, in_progress, resolved
-    created_at: datetime = Field(default_factory=datetime.now(timezone.utc))
+    resolution_status: ResolutionStatus = "unresolved"
+    conflict_id: str = field(default_factory=_new_id)
+    created_at: datetime = field(default_factory=_utcnow)
 
 
-class DocumentVersion(BaseModel):
+@dataclass(slots=True)
+class DocumentVersion:
     """Document version information"""
-    version_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     content: str
     content_hash: str
     author: str
     changes_summary: str
     parent_version: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.now(timezone.utc))
-    document_metadata: Dict[str, Any] = Field(default_factory=dict)
+    version_id: str = field(default_factory=_new_id)
+    created_at: datetime = field(default_factory=_utcnow)
+    document_metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 # class WorkflowMetrics(BaseModel):
@@ -96,7 +155,7 @@ class AmendmentWorkflowState(BaseModel):
     # Parties and stakeholders
     parties: List[str] = Field(description="List of party IDs involved in amendment")
     party_responses: Dict[str, PartyResponse] = Field(default_factory=dict)
-    required_approvals: List[str] = Field(default_factory=list)
+    required_approvals: Tuple[str, ...] = ()
     received_approvals: List[str] = Field(default_factory=list)
     
     # Amendment content
@@ -140,7 +199,11 @@ class AmendmentWorkflowState(BaseModel):
     # metrics: WorkflowMetrics = Field(default_factory=WorkflowMetrics)
     
     # Error handling
-    errors: List[Dict[str, Any]] = Field(default_factory=list)
+    errors: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Most recent errors, capped at MAX_ERROR_HISTORY entries"
+    )
+    error_count: int = 0
     retry_count: int = 0
     max_retries: int = 3
     
@@ -151,6 +214,7 @@ class AmendmentWorkflowState(BaseModel):
             "auto_approve_threshold": 0.8,
             "conflict_resolution_timeout": 120,  # 2 hours
             "max_review_rounds": 2, # Max number of party review cycles
+            "early_abort_on_rejection": False, # Cancel outstanding party reviews once one party rejects
             "require_legal_review": True,
             "enable_ai_mediation": True
         }
@@ -161,35 +225,176 @@ class AmendmentWorkflowState(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
     
+    # Memoized predicate results; never serialized. Cleared by every method
+    # that changes a party's response.
+    _consensus_cache: Optional[bool] = PrivateAttr(default=None)
+    _pending_cache: Optional[List[str]] = PrivateAttr(default=None)
+    # Serialized proposed_changes shared by every prompt built from this state
+    _proposed_changes_json: Optional[str] = PrivateAttr(default=None)
+    # Clause-focused contract excerpts, keyed by token budget; shared by every
+    # party agent reviewing the same state within a node run
+    _clause_excerpts: Dict[int, str] = PrivateAttr(default_factory=dict)
+    # Number of party responses per status, kept in step with party_responses
+    _status_counts: Counter = PrivateAttr(default_factory=Counter)
+    # Parties with no response yet or a "pending" one
+    _pending_parties: set = PrivateAttr(default_factory=set)
+    # conflict_id -> ConflictInfo lookup over self.conflicts
+    _conflict_index: Dict[str, ConflictInfo] = PrivateAttr(default_factory=dict)
+    # party_id -> first conflict_id that party is affected by
+    _party_conflicts: Dict[str, str] = PrivateAttr(default_factory=dict)
+    
+    def model_post_init(self, __context: Any) -> None:
+        self._status_counts = Counter(r.status for r in self.party_responses.values())
+        self._rebuild_pending_parties()
+        self._conflict_index = {c.conflict_id: c for c in self.conflicts}
+        self._party_conflicts = {}
+        for conflict in self.conflicts:
+            for party_id in conflict.affected_parties:
+                self._party_conflicts.setdefault(party_id, conflict.conflict_id)
+    
+    @property
+    def approved_count(self) -> int:
+        """Number of parties whose current response is an approval"""
+        return self._status_counts["approved"]
+    
+    @property
+    def rejected_count(self) -> int:
+        """Number of parties whose current response is a rejection"""
+        return self._status_counts["rejected"]
+    
+    def _rebuild_pending_parties(self) -> None:
+        self._pending_parties = {
+            party for party in self.parties
+            if party not in self.party_responses or
+            self.party_responses[party].status == "pending"
+        }
+    
+    def _set_response_status(self, party_id: str, old_status: Optional[str], new_status: str) -> None:
+        if old_status is not None:
+            self._status_counts[old_status] -= 1
+        self._status_counts[new_status] += 1
+        # Only workflow parties count as pending, matching get_pending_parties
+        if new_status == "pending" and party_id in self.parties:
+            self._pending_parties.add(party_id)
+        else:
+            self._pending_parties.discard(party_id)
+    
+    def _invalidate_response_caches(self) -> None:
+        self._consensus_cache = None
+        self._pending_cache = None
+    
+    def _invalidate_prompt_caches(self) -> None:
+        self._proposed_changes_json = None
+        self._clause_excerpts.clear()
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # Serialized changes and contract excerpts are derived from these fields,
+        # so any reassignment (not only update_proposed_changes) drops them; the
+        # pending set and predicate memos are derived from parties
+        if name in _PROMPT_SOURCE_FIELDS:
+            self._invalidate_prompt_caches()
+        elif name == "parties":
+            self._rebuild_pending_parties()
+            self._invalidate_response_caches()
+    
+    def proposed_changes_json(self) -> str:
+        """Compact, key-sorted JSON of proposed_changes, serialized once per change-set"""
+        if self._proposed_changes_json is None:
+            self._proposed_changes_json = orjson.dumps(
+                self.proposed_changes, default=str,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            ).decode()
+        return self._proposed_changes_json
+    
+    def update_proposed_changes(self, proposed_changes: Dict[str, Any]) -> None:
+        """Replace the proposed changes"""
+        self.proposed_changes = proposed_changes
+        self.updated_at = datetime.utcnow()
+    
+    def relevant_contract_excerpt(self, max_tokens: int) -> str:
+        """
+        Contract paragraphs mentioning a clause named in proposed_changes, capped at
+        max_tokens. Falls back to the start of the contract when none match.
+        """
+        excerpt = self._clause_excerpts.get(max_tokens)
+        if excerpt is None:
+            contract = self.original_contract or ""
+            paragraphs = split_paragraphs(contract)
+            matched = clause_paragraphs(paragraphs, self.proposed_changes)
+            # Keep contract order and drop paragraphs matched by more than one clause
+            selected = set(matched.values())
+            relevant = "\n\n".join(p for p in paragraphs if p in selected) or contract
+            excerpt = self._clause_excerpts[max_tokens] = truncate_tokens(relevant, max_tokens)
+        return excerpt
+    
     def add_party_response(self, party_id: str, response: PartyResponse) -> None:
         """Add or update a party's response"""
+        previous = self.party_responses.get(party_id)
+        self._set_response_status(party_id, previous.status if previous else None, response.status)
         self.party_responses[party_id] = response
-        if response.status == "approved":
+        self._track_approval(party_id, response.status)
+        self._invalidate_response_caches()
+        self.updated_at = datetime.utcnow()
+    
+    def _track_approval(self, party_id: str, status: str) -> None:
+        """Keep received_approvals in step with the party's current status"""
+        if status == "approved":
             if party_id not in self.received_approvals:
                 self.received_approvals.append(party_id)
         elif party_id in self.received_approvals:
             self.received_approvals.remove(party_id)
+    
+    def update_party_status(self, party_id: str, status: PartyStatus) -> bool:
+        """Change the status of an existing party response"""
+        response = self.party_responses.get(party_id)
+        if response is None:
+            return False
+        self._set_response_status(party_id, response.status, status)
+        response.status = status
+        self._track_approval(party_id, status)
+        self._invalidate_response_caches()
         self.updated_at = datetime.utcnow()
+        return True
     
     def add_conflict(self, conflict: ConflictInfo) -> None:
         """Add a new conflict to the workflow"""
         self.conflicts.append(conflict)
+        self._conflict_index[conflict.conflict_id] = conflict
+        for party_id in conflict.affected_parties:
+            self._party_conflicts.setdefault(party_id, conflict.conflict_id)
         if conflict.conflict_id not in self.active_conflicts:
             self.active_conflicts.append(conflict.conflict_id)
         self.updated_at = datetime.utcnow()
     
+    def get_conflict(self, conflict_id: str) -> Optional[ConflictInfo]:
+        """Look up a conflict by its ID"""
+        return self._conflict_index.get(conflict_id)
+    
+    def has_party_conflict(self, party_id: str) -> bool:
+        """Check whether any recorded conflict already involves this party"""
+        return party_id in self._party_conflicts
+    
     def resolve_conflict(self, conflict_id: str, resolution_notes: str = "") -> bool:
         """Mark a conflict as resolved"""
-        for conflict in self.conflicts:
-            if conflict.conflict_id == conflict_id:
-                conflict.resolution_status = "resolved"
-                if conflict_id in self.active_conflicts:
-                    self.active_conflicts.remove(conflict_id)
-                if conflict_id not in self.resolved_conflicts:
-                    self.resolved_conflicts.append(conflict_id)
-                self.updated_at = datetime.utcnow()
-                return True
-        return False
+        conflict = self._conflict_index.get(conflict_id)
+        if conflict is None:
+            return False
+        conflict.resolution_status = "resolved"
+        if conflict_id in self.active_conflicts:
+            self.active_conflicts.remove(conflict_id)
+        if conflict_id not in self.resolved_conflicts:
+            self.resolved_conflicts.append(conflict_id)
+        self.updated_at = datetime.utcnow()
+        return True
+    
+    def add_error(self, error_info: Dict[str, Any]) -> None:
+        """Record an error, keeping only the most recent MAX_ERROR_HISTORY"""
+        self.errors.append(error_info)
+        self.error_count += 1
+        if len(self.errors) > MAX_ERROR_HISTORY:
+            del self.errors[:-MAX_ERROR_HISTORY]
+        self.updated_at = datetime.utcnow()
     
     def add_document_version(self, version: DocumentVersion) -> None:
         """Add a new document version"""
@@ -205,8 +410,8 @@ class AmendmentWorkflowState(BaseModel):
             "timestamp": datetime.utcnow().isoformat(),
             "duration_seconds": duration,
             "success": success,
-            "input_hash": hash(str(input_data)) if input_data else None,
-            "output_hash": hash(str(output_data)) if output_data else None
+            "input_hash": _fingerprint(input_data),
+            "output_hash": _fingerprint(output_data)
         }
         self.execution_history.append(execution_record)
         
@@ -219,34 +424,46 @@ class AmendmentWorkflowState(BaseModel):
     
     def get_pending_parties(self) -> List[str]:
         """Get list of parties that haven't responded yet"""
-        return [
-            party for party in self.parties 
-            if party not in self.party_responses or 
-            self.party_responses[party].status == "pending"
-        ]
+        if self._pending_cache is None:
+            pending = self._pending_parties
+            self._pending_cache = [party for party in self.parties if party in pending]
+        return list(self._pending_cache)
+    
+    def has_pending_parties(self) -> bool:
+        """Check if any party still has to respond"""
+        return bool(self._pending_parties)
     
     def is_consensus_reached(self) -> bool:
         """Check if consensus has been reached among all parties"""
-        if not self.parties:
+        if self._consensus_cache is None:
+            self._consensus_cache = self._compute_consensus()
+        return self._consensus_cache
+    
+    def _compute_consensus(self) -> bool:
+        if not self.parties or self.approved_count < len(self.parties):
             return False
             
         for party in self.parties:
             if party not in self.party_responses:
                 return False
-            if self.party_responses[party].status not in ["approved"]:
+            if self.party_responses[party].status != "approved":
                 return False
                 
         return True
     
     def has_active_conflicts(self) -> bool:
         """Check if there are any unresolved conflicts"""
-        return len(self.active_conflicts) > 0
+        return bool(self.active_conflicts)
 
     
-    def update_status(self, new_status: AmendmentStatus, notes: str = "") -> None:
-        """Update workflow status and log the change"""
+    def update_status(self, new_status: AmendmentStatus, notes: str = "",
+                      outputs: Optional[Dict[str, Any]] = None) -> None:
+        """Update workflow status and log the change, merging any node outputs produced with it"""
         old_status = self.status
-        self.status = new_status
+        # Always store the enum member itself (not a bare string) so status
+        # comparisons stay member-to-member.
+        self.status = AmendmentStatus(new_status)
+        self._invalidate_response_caches()
         self.updated_at = datetime.utcnow()
         
         # Log status change
@@ -257,9 +474,9 @@ class AmendmentWorkflowState(BaseModel):
             "notes": notes
         }
         
-        if "status_changes" not in self.node_outputs:
-            self.node_outputs["status_changes"] = []
-        self.node_outputs["status_changes"].append(status_change)
+        if outputs:
+            self.node_outputs.update(outputs)
+        self.node_outputs.setdefault("status_changes", []).append(status_change)
         
 
     class Config:
@@ -271,6 +488,16 @@ class AmendmentWorkflowState(BaseModel):
         """Convert state to dictionary for serialization"""
         return self.model_dump(mode='json')
     
+    def to_json_bytes(self, exclude: Optional[set] = None) -> bytes:
+        """Serialize state straight to JSON bytes"""
+        # orjson encodes datetimes, enums and the record dataclasses natively,
+        # so the python-mode dump is enough and skips pydantic's JSON coercion.
+        return orjson.dumps(self.model_dump(exclude=exclude), default=str, option=orjson.OPT_NON_STR_KEYS)
+    
+    def log_snapshot(self) -> bytes:
+        """Serialized workflow data for log_execution input hashes, without the audit trail"""
+        return self.to_json_bytes(exclude=_AUDIT_FIELDS)
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AmendmentWorkflowState':
         """Create state from dictionary"""
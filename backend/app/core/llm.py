@@ -0,0 +1,99 @@
+# backend/core/llm.py
+"""
+Shared LLM Client Setup
+
+Every ChatOpenAI instance in the workflow goes through get_llm so that all
+async calls share one pooled HTTP/2 connection to the OpenAI API instead of
+each node opening its own.
+"""
+
+from typing import Any, Optional
+from weakref import WeakKeyDictionary
+from langchain_openai import ChatOpenAI
+import asyncio
+import httpx
+
+# Sized for parallel party reviews and conflict validations in flight together
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+
+
+class _UnusedTransport(httpx.AsyncBaseTransport):
+    """Transport for LoopPooledAsyncClient itself, which never sends directly"""
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        raise RuntimeError("LoopPooledAsyncClient sends through its per-loop pools")
+
+
+class LoopPooledAsyncClient(httpx.AsyncClient):
+    """
+    Async HTTP client that sends through a connection pool owned by the running
+    event loop.
+
+    Chat models are built once at import and keep whichever client they were
+    given, so this object is never closed itself: aclose releases only the
+    current loop's pool, and the next request on any loop opens a fresh one.
+    Models therefore survive application restarts and are never handed a pool
+    bound to another event loop.
+    """
+    
+    def __init__(self, **config: Any):
+        # The outer client only builds requests (base URL, headers, timeouts), so
+        # it gets no connection pool of its own; environment proxies would open
+        # one per mount, and those are resolved by the per-loop pools instead
+        super().__init__(**{**config, "transport": _UnusedTransport(), "trust_env": False})
+        self._config = config
+        self._pools: "WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = WeakKeyDictionary()
+    
+    def _pool(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None or pool.is_closed:
+            pool = self._pools[loop] = httpx.AsyncClient(**self._config)
+        return pool
+    
+    async def send(self, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        return await self._pool().send(request, **kwargs)
+    
+    async def aclose(self) -> None:
+        """Close the current event loop's connection pool"""
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.aclose()
+
+
+_http_async_client: Optional[LoopPooledAsyncClient] = None
+
+
+def get_http_async_client() -> httpx.AsyncClient:
+    """Return the process-wide async HTTP client, creating it on first use"""
+    global _http_async_client
+    if _http_async_client is None:
+        _http_async_client = LoopPooledAsyncClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+            ),
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        )
+    return _http_async_client
+
+
+def get_llm(model: str, temperature: float, **kwargs) -> ChatOpenAI:
+    """Create a chat model bound to the shared HTTP client"""
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        http_async_client=get_http_async_client(),
+        **kwargs
+    )
+
+
+async def close_llm_clients() -> None:
+    """
+    Release the shared client's connections for the current event loop; call on
+    application shutdown. Models built with get_llm stay usable afterwards.
+    """
+    if _http_async_client is not None:
+        await _http_async_client.aclose()
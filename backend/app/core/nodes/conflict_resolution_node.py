@@ -6,13 +6,202 @@ This node handles the detection, analysis, and resolution of conflicts
 between different parties' proposed changes using AI mediation.
 """
 
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
+from typing import Dict, List, Any
+from collections import defaultdict
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain.schema import HumanMessage, SystemMessage
-from datetime import datetime
-import json
+from datetime import datetime, timezone
+from cachetools import LRUCache, TTLCache
+import asyncio
+import hashlib
+import heapq
+import logging
+import math
+import orjson
+import time
 
 from ..graph_state import AmendmentWorkflowState, ConflictInfo
+from ..llm import get_llm, get_http_async_client
+from ..contract_text import split_paragraphs, clause_paragraphs
+
+logger = logging.getLogger(__name__)
+
+# Party response statuses that raise a conflict needing mediation
+_CONFLICTING_STATUSES = frozenset({"rejected", "requested_changes"})
+
+# Resolution strategy rules in priority order. Each pattern is
+# (severity, complexity, conflict_type, more_than_two_parties); None matches anything.
+_STRATEGY_RULES = (
+    (("high", "complex", None, None), "precedent_based"),  # Use established legal precedents
+    ((None, None, "contradictory_terms", None), "compromise_based"),  # Split the difference
+    ((None, None, "policy_violation", None), "alternative_approach"),  # Find different way to achieve goals
+    ((None, None, None, True), "win_win_optimization"),  # Optimize for all parties
+)
+_DEFAULT_STRATEGY = "value_maximization"  # Maximize overall value
+
+# Party risk levels mapped onto conflict severities
+_SEVERITY_BY_RISK_LEVEL = {"high": "high", "medium": "medium", "low": "low"}
+# Per-call prompt bodies; callers fill them with already-serialized fields
+_ANALYSIS_TEMPLATE = """Active Conflicts:
+{conflicts}
+
+Party Responses:
+{responses}
+
+Original Proposed Changes:
+{changes}"""
+
+_RESOLUTION_TEMPLATE = """Original Contract Excerpt:
+{excerpt}
+
+Proposed Changes:
+{changes}
+
+Conflicts:
+{conflicts}"""
+
+_VALIDATION_TEMPLATE = """Original Conflict: {description}
+Proposed Resolution: {solution}
+Specific Changes: {changes}"""
+
+
+def _to_json(data: Any) -> str:
+    """Compact JSON for prompts; indentation only costs the model tokens"""
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Resolved conflicts offered to the mediator as precedents, ranked by description similarity
+MAX_PRECEDENTS = 3
+
+# Unit-normalized description embeddings keyed by text, shared across node instances
+_EMBEDDING_CACHE: LRUCache = LRUCache(maxsize=4096)
+
+# Prompt budget for contract text: one shared excerpt plus a short excerpt per affected clause
+CONTRACT_EXCERPT_TOKENS = 400
+CLAUSE_EXCERPT_CHARS = 300
+
+
+def _clause_excerpts(paragraphs: List[str], clauses: List[str]) -> Dict[str, str]:
+    """Map each named clause to the start of the first contract paragraph that mentions it"""
+    return {
+        clause: paragraph[:CLAUSE_EXCERPT_CHARS]
+        for clause, paragraph in clause_paragraphs(paragraphs, clauses).items()
+    }
+
+
+# Upper bound on resolution validation calls in flight at once. Resolutions
+# themselves go out as a single batched call per run.
+MAX_CONCURRENT_VALIDATIONS = 8
+
+# Mediator confidence at or above which non-high-severity resolutions skip the validation call
+VALIDATION_SKIP_CONFIDENCE = 0.9
+
+# Parsed mediator resolutions keyed by _resolution_cache_key. Shared across node
+# instances (the orchestrator builds a fresh node per run) so repeated conflicts
+# in bulk amendments skip the LLM round-trip.
+_RESOLUTION_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+
+# _finalize_resolution outcomes whose resolution passed validation
+_VALIDATED_STATUSES = frozenset({"resolved", "partially_resolved"})
+
+# Invariant prompt prefixes, built once at import instead of being re-formatted
+# around the data on every call; per-conflict data follows in the HumanMessage.
+# They are well under the 1024-token minimum for OpenAI's automatic prompt
+# caching, so the saving is in-process only.
+_ANALYSIS_INSTRUCTIONS = """You are an expert contract mediator with deep understanding of multi-party negotiations.
+
+Analyze the contract amendment conflicts you are given to understand patterns and relationships.
+
+Provide analysis in JSON format:
+{
+    "conflict_patterns": ["patterns you identify"],
+    "root_causes": ["underlying causes of conflicts"],
+    "affected_relationships": ["which party relationships are strained"],
+    "priority_order": ["conflict_ids in order of resolution priority"],
+    "resolution_complexity": {
+        "conflict_id": "simple|moderate|complex"
+    },
+    "recommended_strategy": "overall mediation approach",
+    "quick_wins": ["conflicts that can be easily resolved"],
+    "escalation_needed": ["conflicts requiring human intervention"]
+}"""
+
+_RESOLUTION_INSTRUCTIONS = """You are an expert mediator resolving contract disputes.
+You are mediating contract amendment conflicts between multiple parties. Each conflict
+comes with the resolution strategy to use for it.
+
+For every conflict, propose a specific resolution that:
+1. Addresses the core conflict fairly
+2. Considers each party's interests and constraints
+3. Maintains legal validity and business viability
+4. Provides clear, actionable next steps
+
+Provide one resolution per conflict in JSON format:
+{
+    "resolutions": [
+        {
+            "conflict_id": "id of the conflict this resolves",
+            "resolution_type": "compromise|alternative_approach|clarification|restructure",
+            "proposed_solution": "detailed description of the solution",
+            "specific_changes": [
+                {
+                    "clause": "which clause to modify",
+                    "current_conflict": "what's conflicting",
+                    "proposed_text": "new proposed text",
+                    "rationale": "why this resolves the conflict"
+                }
+            ],
+            "party_benefits": {
+                "party_id": "how this benefits each party"
+            },
+            "implementation_steps": ["step 1", "step 2", "..."],
+            "risk_mitigation": "how this reduces risks for all parties",
+            "confidence_score": 0.85,
+            "requires_party_approval": true,
+            "alternative_options": ["other options if this is rejected"]
+        }
+    ]
+}"""
+
+_VALIDATION_INSTRUCTIONS = """You are a legal and business analyst validating contract resolutions.
+
+Validate the proposed conflict resolution you are given. Check for:
+1. Legal validity and enforceability
+2. Business viability for all parties
+3. Consistency with existing contract terms
+4. Potential for creating new conflicts
+5. Implementation feasibility
+
+Return JSON:
+{
+    "is_valid": true/false,
+    "confidence": 0.85,
+    "issues": ["list of any issues found"],
+    "recommendations": ["suggestions for improvement"],
+    "legal_risks": ["potential legal issues"],
+    "business_risks": ["potential business issues"]
+}"""
+
+# Every prompt here expects JSON back
+_JSON_MODE = {"response_format": {"type": "json_object"}}
+
+# The orchestrator builds a fresh node for every resolution run, so the clients
+# live at module scope and are shared by all runs. Resolution drafting gets the
+# strong model; analysis and validation are constrained classification-style
+# tasks and run on the small one.
+_LLM_HEAVY = get_llm(
+    model="gpt-4-turbo-preview",
+    temperature=0.4,  # Slightly higher temp for creativity
+    streaming=True,
+    model_kwargs=_JSON_MODE
+)
+_LLM_LIGHT = get_llm(
+    model="gpt-4o-mini",
+    temperature=0.2,
+    streaming=True,
+    model_kwargs=_JSON_MODE
+)
+_EMBEDDINGS = OpenAIEmbeddings(model="text-embedding-3-small", http_async_client=get_http_async_client())
 
 
 class ConflictResolutionNode:
@@ -21,7 +210,9 @@ class ConflictResolutionNode:
     """
     
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4-turbo-preview", temperature=0.4)  # Slightly higher temp for creativity
+        self.llm_heavy = _LLM_HEAVY
+        self.llm_light = _LLM_LIGHT
+        self.embeddings = _EMBEDDINGS
         # self.tools = get_contract_tools()
         self.mediation_strategies = [
             "compromise_based",
@@ -30,51 +221,76 @@ class ConflictResolutionNode:
             "precedent_based",
             "win_win_optimization"
         ]
+        self._validation_semaphore = asyncio.Semaphore(MAX_CONCURRENT_VALIDATIONS)
     
     async def __call__(self, state: AmendmentWorkflowState) -> Dict[str, Any]:
         """
         Main conflict resolution logic
         """
-        print(f"⚡ CONFLICT RESOLUTION: Processing amendment {state.amendment_id}")
+        logger.info("⚡ CONFLICT RESOLUTION: Processing amendment %s", state.amendment_id)
         
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
+        # Serialize the input state once; both the success and error paths log it
+        input_snapshot = state.log_snapshot()
         
         try:
             # First, identify any new conflicts from party responses
             self._identify_conflicts(state)
 
             if not state.active_conflicts:
-                print("   No active conflicts to resolve")
+                logger.info("   No active conflicts to resolve")
                 return {"action": "no_conflicts", "message": "No active conflicts found"}
             
-            print(f"   Found {len(state.active_conflicts)} active conflicts to resolve.")
+            logger.info("   Found %d active conflicts to resolve.", len(state.active_conflicts))
 
             # Categorize conflicts by type and severity
             conflict_analysis = await self._analyze_conflicts(state)
             
             # Apply appropriate resolution strategy for each conflict
+            # Snapshot the active ids; state.active_conflicts only changes after the batch returns
+            active_snapshot = tuple(state.active_conflicts)
+            conflicts_to_resolve = [
+                conflict for conflict in map(state.get_conflict, active_snapshot) if conflict
+            ]
+            
+            # Bucket previously resolved conflicts by type once for precedent lookup
+            resolved_by_type = defaultdict(list)
+            for other_conflict in state.conflicts:
+                if other_conflict.resolution_status == "resolved":
+                    resolved_by_type[other_conflict.conflict_type].append(other_conflict)
+            
+            outcomes = await self._resolve_conflicts_batch(
+                state, conflicts_to_resolve, conflict_analysis, resolved_by_type
+            )
+            
+            # Record outcomes serially so state bookkeeping never interleaves
             resolution_results = []
-            for conflict_id in state.active_conflicts.copy():
-                conflict = next((c for c in state.conflicts if c.conflict_id == conflict_id), None)
-                if conflict:
-                    resolution = await self._resolve_conflict(state, conflict, conflict_analysis)
-                    resolution_results.append(resolution)
-                    
-                    # If resolution successful, mark as resolved
-                    if resolution.get("status") == "resolved":
-                        state.resolve_conflict(conflict_id, resolution.get("resolution_notes", ""))
+            resolved_count = 0
+            for conflict, resolution in zip(conflicts_to_resolve, outcomes):
+                if isinstance(resolution, Exception):
+                    resolution = {
+                        "conflict_id": conflict.conflict_id,
+                        "status": "resolution_error",
+                        "error": str(resolution)
+                    }
+                resolution_results.append(resolution)
+                
+                # If resolution successful, mark as resolved
+                if resolution.get("status") == "resolved":
+                    state.resolve_conflict(conflict.conflict_id, resolution.get("resolution_notes", ""))
+                    resolved_count += 1
         
 
             # Log execution
-            duration = (datetime.utcnow() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             result = {
                 "conflicts_processed": len(resolution_results),
-                "conflicts_resolved": sum(1 for r in resolution_results if r.get("status") == "resolved"),
+                "conflicts_resolved": resolved_count,
                 "remaining_conflicts": len(state.active_conflicts),
                 "resolution_details": resolution_results
             }
             
-            state.log_execution("conflict_resolution", state.to_dict(), result, duration, True)
+            state.log_execution("conflict_resolution", input_snapshot, result, duration, True)
             
             return result
             
@@ -82,15 +298,43 @@ class ConflictResolutionNode:
             error_info = {
                 "node": "conflict_resolution",
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
-            state.errors.append(error_info)
+            state.add_error(error_info)
             
-            duration = (datetime.utcnow() - start_time).total_seconds()
-            state.log_execution("conflict_resolution", state.to_dict(), {"error": str(e)}, duration, False)
+            duration = time.perf_counter() - start_time
+            state.log_execution("conflict_resolution", input_snapshot, {"error": str(e)}, duration, False)
             
             return {"action": "error", "error": str(e)}
     
+    async def _stream_content(self, llm: ChatOpenAI, messages: List) -> str:
+        """Stream an LLM reply and return the assembled content.
+
+        Tokens are consumed as they arrive (and surface through LangGraph's
+        event stream), so network transfer overlaps with generation. Every
+        reply here must be a JSON object, so one that opens with anything
+        other than "{" is abandoned on its first token instead of being read
+        to the end only to fail parsing.
+        """
+        chunks = []
+        opened = False
+        async for chunk in llm.astream(messages):
+            if not opened:
+                head = chunk.content.lstrip()
+                if head:
+                    if head[0] != "{":
+                        raise ValueError(f"Expected a JSON object, reply starts with {head[:20]!r}")
+                    opened = True
+            chunks.append(chunk.content)
+        return "".join(chunks)
+    
+    async def _complete_json(self, llm: ChatOpenAI, messages: List) -> Dict[str, Any]:
+        """Run a JSON-mode completion, retrying once if the reply is not a parseable object"""
+        try:
+            return orjson.loads(await self._stream_content(llm, messages))
+        except ValueError:  # includes orjson.JSONDecodeError
+            return orjson.loads(await self._stream_content(llm, messages))
+    
     async def _analyze_conflicts(self, state: AmendmentWorkflowState) -> Dict[str, Any]:
         """Analyze all conflicts to understand patterns and relationships"""
         
@@ -106,151 +350,217 @@ class ConflictResolutionNode:
                     "affected_clauses": conflict.affected_clauses
                 })
         
-        analysis_prompt = f"""
-        Analyze these contract amendment conflicts to understand patterns and relationships:
-        
-        Active Conflicts:
-        {json.dumps(conflicts_data, indent=2)}
-        
-        Party Responses:
-        {[(p.organization, p.status, p.comments) for p in state.party_responses.values()]}
-        
-        Original Proposed Changes:
-        {json.dumps(state.proposed_changes, indent=2)}
-        
-        Provide analysis in JSON format:
-        {{
-            "conflict_patterns": ["patterns you identify"],
-            "root_causes": ["underlying causes of conflicts"],
-            "affected_relationships": ["which party relationships are strained"],
-            "priority_order": ["conflict_ids in order of resolution priority"],
-            "resolution_complexity": {{
-                "conflict_id": "simple|moderate|complex"
-            }},
-            "recommended_strategy": "overall mediation approach",
-            "quick_wins": ["conflicts that can be easily resolved"],
-            "escalation_needed": ["conflicts requiring human intervention"]
-        }}
-        """
+        analysis_prompt = _ANALYSIS_TEMPLATE.format(
+            conflicts=_to_json(conflicts_data),
+            responses=_to_json([(p.organization, p.status, p.comments) for p in state.party_responses.values()]),
+            changes=state.proposed_changes_json()
+        )
         
         messages = [
-            SystemMessage(content="You are an expert contract mediator with deep understanding of multi-party negotiations."),
+            SystemMessage(content=_ANALYSIS_INSTRUCTIONS),
             HumanMessage(content=analysis_prompt)
         ]
         
-        response = await self.llm.ainvoke(messages)
-        
+        # The analysis is advisory (it only tunes per-conflict complexity), so a bad
+        # reply falls back to default strategies instead of failing resolution
         try:
-            return json.loads(response.content)
-        except json.JSONDecodeError:
-            return {"raw_analysis": response.content, "parse_error": True}
+            return await self._complete_json(self.llm_light, messages)
+        except Exception as e:
+            logger.warning("   Conflict analysis failed (%s); using default complexity", e)
+            return {}
     
-    async def _resolve_conflict(self, state: AmendmentWorkflowState, conflict: ConflictInfo, 
-                              analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """Resolve a specific conflict using AI mediation"""
-        
-        print(f"   🤝 Resolving conflict: {conflict.description[:50]}...")
-        
-        # Select resolution strategy based on conflict complexity
-        complexity = analysis.get("resolution_complexity", {}).get(conflict.conflict_id, "moderate")
-        strategy = self._select_resolution_strategy(conflict, complexity)
-        
-        # Gather relevant context for this conflict
-        context = await self._gather_conflict_context(state, conflict)
-        
-        resolution_prompt = f"""
-        You are mediating a contract amendment conflict between multiple parties.
-        
-        Conflict Details:
-        - Type: {conflict.conflict_type}
-        - Description: {conflict.description}
-        - Severity: {conflict.severity}
-        - Affected Parties: {conflict.affected_parties}
-        - Affected Clauses: {conflict.affected_clauses}
-        
-        Context:
-        {json.dumps(context, indent=2)}
-        
-        Resolution Strategy: {strategy}
-        
-        Your task is to propose a specific resolution that:
-        1. Addresses the core conflict fairly
-        2. Considers each party's interests and constraints
-        3. Maintains legal validity and business viability
-        4. Provides clear, actionable next steps
-        
-        Provide your resolution in JSON format:
-        {{
-            "resolution_type": "compromise|alternative_approach|clarification|restructure",
-            "proposed_solution": "detailed description of the solution",
-            "specific_changes": [
-                {{
-                    "clause": "which clause to modify",
-                    "current_conflict": "what's conflicting",
-                    "proposed_text": "new proposed text",
-                    "rationale": "why this resolves the conflict"
-                }}
-            ],
-            "party_benefits": {{
-                "party_id": "how this benefits each party"
-            }},
-            "implementation_steps": ["step 1", "step 2", "..."],
-            "risk_mitigation": "how this reduces risks for all parties",
-            "confidence_score": 0.85,
-            "requires_party_approval": true,
-            "alternative_options": ["other options if this is rejected"]
-        }}
+    async def _resolve_conflicts_batch(self, state: AmendmentWorkflowState, conflicts: List[ConflictInfo],
+                                       analysis: Dict[str, Any],
+                                       resolved_by_type: Dict[str, List[ConflictInfo]]) -> List[Any]:
+        """
+        Resolve conflicts using AI mediation, with one LLM call for every
+        conflict not already cached. Returns one outcome per conflict, in order;
+        an outcome is an exception if that conflict's validation raised.
         """
         
-        messages = [
-            SystemMessage(content=f"You are an expert mediator using {strategy} strategy to resolve contract disputes."),
-            HumanMessage(content=resolution_prompt)
-        ]
-        
-        response = await self.llm.ainvoke(messages)
+        strategies = {}
+        complexities = {}
+        cache_keys = {}
+        resolutions = {}
+        uncached = []
+        for conflict in conflicts:
+            logger.info("   🤝 Resolving conflict: %.50s...", conflict.description)
+            
+            # Select resolution strategy based on conflict complexity
+            complexity = analysis.get("resolution_complexity", {}).get(conflict.conflict_id, "moderate")
+            strategy = self._select_resolution_strategy(conflict, complexity)
+            strategies[conflict.conflict_id] = strategy
+            complexities[conflict.conflict_id] = complexity
+            
+            cache_key = self._resolution_cache_key(state, conflict, strategy)
+            cache_keys[conflict.conflict_id] = cache_key
+            cached = _RESOLUTION_CACHE.get(cache_key)
+            if cached is not None:
+                # The cached payload names the conflict it was first produced for
+                resolutions[conflict.conflict_id] = {**cached, "conflict_id": conflict.conflict_id}
+            else:
+                uncached.append(conflict)
         
-        try:
-            resolution_data = json.loads(response.content)
+        if uncached:
+            contract = state.original_contract or ""
+            paragraphs = split_paragraphs(contract)
             
-            # Validate the resolution
-            validation_result = await self._validate_resolution(state, conflict, resolution_data)
+            precedents = await self._find_precedents(uncached, resolved_by_type)
             
-            if validation_result["is_valid"]:
-                # Apply the resolution
-                application_result = await self._apply_resolution(state, conflict, resolution_data)
-                
-                return {
+            conflicts_data = []
+            for conflict in uncached:
+                # Gather relevant context for this conflict
+                context = self._gather_conflict_context(
+                    state, conflict, precedents.get(conflict.conflict_id, [])
+                )
+                conflicts_data.append({
                     "conflict_id": conflict.conflict_id,
-                    "status": "resolved" if application_result["success"] else "partially_resolved",
-                    "resolution_data": resolution_data,
-                    "validation": validation_result,
-                    "application": application_result,
-                    "resolution_notes": f"Applied {strategy} strategy: {resolution_data.get('proposed_solution', '')[:100]}"
-                }
+                    "resolution_strategy": strategies[conflict.conflict_id],
+                    "type": conflict.conflict_type,
+                    "description": conflict.description,
+                    "severity": conflict.severity,
+                    "affected_parties": conflict.affected_parties,
+                    "affected_clauses": conflict.affected_clauses,
+                    "clause_excerpts": _clause_excerpts(paragraphs, conflict.affected_clauses),
+                    "context": context
+                })
+            
+            resolution_prompt = _RESOLUTION_TEMPLATE.format(
+                excerpt=state.relevant_contract_excerpt(CONTRACT_EXCERPT_TOKENS) if contract else None,
+                changes=state.proposed_changes_json(),
+                conflicts=_to_json(conflicts_data)
+            )
+            
+            messages = [
+                SystemMessage(content=_RESOLUTION_INSTRUCTIONS),
+                HumanMessage(content=resolution_prompt)
+            ]
+            
+            parsed = await self._complete_json(self.llm_heavy, messages)
+            
+            for resolution_data in parsed.get("resolutions", []):
+                conflict_id = resolution_data.get("conflict_id") if isinstance(resolution_data, dict) else None
+                if conflict_id in cache_keys and conflict_id not in resolutions:
+                    resolutions[conflict_id] = resolution_data
+        
+        # Validation stays per conflict; those calls are independent and run concurrently
+        outcomes = await asyncio.gather(
+            *(self._finalize_resolution(state, conflict, strategies[conflict.conflict_id],
+                                        complexities[conflict.conflict_id],
+                                        resolutions.get(conflict.conflict_id))
+              for conflict in conflicts),
+            return_exceptions=True
+        )
+        
+        # Only resolutions that passed validation are reused; anything else is asked
+        # for again next time rather than replayed for the cache's lifetime
+        for conflict, outcome in zip(conflicts, outcomes):
+            cache_key = cache_keys[conflict.conflict_id]
+            if isinstance(outcome, dict) and outcome.get("status") in _VALIDATED_STATUSES:
+                _RESOLUTION_CACHE[cache_key] = resolutions[conflict.conflict_id]
             else:
-                return {
-                    "conflict_id": conflict.conflict_id,
-                    "status": "resolution_failed",
-                    "resolution_data": resolution_data,
-                    "validation": validation_result,
-                    "error": validation_result.get("issues", [])
-                }
-                
-        except json.JSONDecodeError:
+                _RESOLUTION_CACHE.pop(cache_key, None)
+        return outcomes
+    
+    async def _finalize_resolution(self, state: AmendmentWorkflowState, conflict: ConflictInfo, strategy: str,
+                                   complexity: str, resolution_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a proposed resolution and apply it if it holds up"""
+        
+        if resolution_data is None:
             return {
                 "conflict_id": conflict.conflict_id,
                 "status": "resolution_error", 
-                "error": "Failed to parse resolution response",
-                "raw_response": response.content
+                "error": "No resolution returned for this conflict"
+            }
+        
+        # Validate the resolution, unless the mediator is already confident about a lower-stakes conflict
+        confidence = resolution_data.get("confidence_score", 0)
+        if (isinstance(confidence, (int, float)) and confidence >= VALIDATION_SKIP_CONFIDENCE
+                and conflict.severity != "high"):
+            validation_result = {"is_valid": True, "confidence": confidence, "issues": [], "skipped": True}
+        else:
+            validation_result = await self._validate_resolution(state, conflict, resolution_data, complexity)
+        
+        if validation_result["is_valid"]:
+            # Apply the resolution
+            application_result = self._apply_resolution(state, conflict, resolution_data)
+            
+            return {
+                "conflict_id": conflict.conflict_id,
+                "status": "resolved" if application_result["success"] else "partially_resolved",
+                "resolution_data": resolution_data,
+                "validation": validation_result,
+                "application": application_result,
+                "resolution_notes": f"Applied {strategy} strategy: {resolution_data.get('proposed_solution', '')[:100]}"
             }
+        else:
+            return {
+                "conflict_id": conflict.conflict_id,
+                "status": "resolution_failed",
+                "resolution_data": resolution_data,
+                "validation": validation_result,
+                "error": validation_result.get("issues", [])
+            }
+    
+    @staticmethod
+    def _resolution_cache_key(state: AmendmentWorkflowState, conflict: ConflictInfo, strategy: str) -> str:
+        """Key a conflict by its substance and parties rather than its id, scoped to the amendment's changes"""
+        key = (
+            f"{conflict.conflict_type}|{conflict.severity}|{conflict.description}|"
+            f"{sorted(conflict.affected_parties)}|{sorted(conflict.affected_clauses)}|{strategy}|"
+            f"{state.proposed_changes_json()}"
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
     
-    async def _gather_conflict_context(self, state: AmendmentWorkflowState, 
-                                     conflict: ConflictInfo) -> Dict[str, Any]:
+    async def _embed(self, texts: List[str]) -> Dict[str, List[float]]:
+        """Embed texts, reusing vectors already computed for the same text"""
+        vectors = {text: _EMBEDDING_CACHE[text] for text in texts if text in _EMBEDDING_CACHE}
+        missing = [text for text in dict.fromkeys(texts) if text not in vectors]
+        if missing:
+            for text, vector in zip(missing, await self.embeddings.aembed_documents(missing)):
+                norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+                vectors[text] = _EMBEDDING_CACHE[text] = [v / norm for v in vector]
+        return vectors
+    
+    async def _find_precedents(self, conflicts: List[ConflictInfo],
+                               resolved_by_type: Dict[str, List[ConflictInfo]]) -> Dict[str, List[ConflictInfo]]:
+        """Pick the resolved conflicts most similar to each conflict, by description embedding"""
+        
+        resolved = [c for bucket in resolved_by_type.values() for c in bucket]
+        if not resolved:
+            return {}
+        
+        try:
+            vectors = await self._embed([c.description for c in conflicts] + [c.description for c in resolved])
+        except Exception as e:
+            # Embeddings unavailable; fall back to precedents of the same conflict type
+            logger.warning("   Precedent embedding failed (%s); matching on conflict type", e)
+            return {
+                conflict.conflict_id: [
+                    other for other in resolved_by_type.get(conflict.conflict_type, ())
+                    if other.conflict_id != conflict.conflict_id
+                ][:MAX_PRECEDENTS]
+                for conflict in conflicts
+            }
+        
+        precedents = {}
+        for conflict in conflicts:
+            vector = vectors[conflict.description]
+            scored = (
+                (sum(a * b for a, b in zip(vector, vectors[other.description])), other)
+                for other in resolved if other.conflict_id != conflict.conflict_id
+            )
+            precedents[conflict.conflict_id] = [
+                other for _, other in heapq.nlargest(MAX_PRECEDENTS, scored, key=lambda pair: pair[0])
+            ]
+        return precedents
+    
+    def _gather_conflict_context(self, state: AmendmentWorkflowState, 
+                               conflict: ConflictInfo,
+                               precedents: List[ConflictInfo]) -> Dict[str, Any]:
         """Gather relevant context for resolving a specific conflict"""
         
         context = {
-            "original_contract_excerpt": state.original_contract[:1000] if state.original_contract else None,
-            "proposed_changes": state.proposed_changes,
             "affected_parties_info": {},
             "similar_conflicts": [],
             "precedents": []
@@ -268,83 +578,49 @@ class ConflictResolutionNode:
                     "conditions": response.conditions
                 }
         
-        # Look for similar conflicts that were resolved
-        for other_conflict in state.conflicts:
-            if (other_conflict.conflict_id != conflict.conflict_id and 
-                other_conflict.resolution_status == "resolved" and
-                other_conflict.conflict_type == conflict.conflict_type):
-                
-                context["similar_conflicts"].append({
-                    "type": other_conflict.conflict_type,
-                    "resolution_approach": "resolved",  # Could store more details
-                    "affected_clauses": other_conflict.affected_clauses
-                })
+        # Similar conflicts that were resolved
+        for other_conflict in precedents:
+            context["similar_conflicts"].append({
+                "type": other_conflict.conflict_type,
+                "description": other_conflict.description,
+                "resolution_approach": "resolved",  # Could store more details
+                "affected_clauses": other_conflict.affected_clauses
+            })
         
         return context
     
     def _select_resolution_strategy(self, conflict: ConflictInfo, complexity: str) -> str:
         """Select appropriate resolution strategy based on conflict characteristics"""
         
-        # Strategy selection logic
-        if conflict.severity == "high" and complexity == "complex":
-            return "precedent_based"  # Use established legal precedents
-        elif conflict.conflict_type == "contradictory_terms":
-            return "compromise_based"  # Split the difference
-        elif conflict.conflict_type == "policy_violation":
-            return "alternative_approach"  # Find different way to achieve goals
-        elif len(conflict.affected_parties) > 2:
-            return "win_win_optimization"  # Optimize for all parties
-        else:
-            return "value_maximization"  # Maximize overall value
+        key = (conflict.severity, complexity, conflict.conflict_type, len(conflict.affected_parties) > 2)
+        for pattern, strategy in _STRATEGY_RULES:
+            if all(expected is None or expected == actual for expected, actual in zip(pattern, key)):
+                return strategy
+        return _DEFAULT_STRATEGY
     
     async def _validate_resolution(self, state: AmendmentWorkflowState, 
-                                 conflict: ConflictInfo, resolution_data: Dict) -> Dict[str, Any]:
+                                 conflict: ConflictInfo, resolution_data: Dict,
+                                 complexity: str = "moderate") -> Dict[str, Any]:
         """Validate proposed resolution for legal and business viability"""
         
-        validation_prompt = f"""
-        Validate this proposed conflict resolution:
-        
-        Original Conflict: {conflict.description}
-        Proposed Resolution: {resolution_data.get('proposed_solution', '')}
-        Specific Changes: {resolution_data.get('specific_changes', [])}
-        
-        Check for:
-        1. Legal validity and enforceability
-        2. Business viability for all parties
-        3. Consistency with existing contract terms
-        4. Potential for creating new conflicts
-        5. Implementation feasibility
-        
-        Return JSON:
-        {{
-            "is_valid": true/false,
-            "confidence": 0.85,
-            "issues": ["list of any issues found"],
-            "recommendations": ["suggestions for improvement"],
-            "legal_risks": ["potential legal issues"],
-            "business_risks": ["potential business issues"]
-        }}
-        """
+        validation_prompt = _VALIDATION_TEMPLATE.format(
+            description=conflict.description,
+            solution=resolution_data.get('proposed_solution', ''),
+            changes=_to_json(resolution_data.get('specific_changes', []))
+        )
         
         messages = [
-            SystemMessage(content="You are a legal and business analyst validating contract resolutions."),
+            SystemMessage(content=_VALIDATION_INSTRUCTIONS),
             HumanMessage(content=validation_prompt)
         ]
         
-        response = await self.llm.ainvoke(messages)
-        
-        try:
-            return json.loads(response.content)
-        except json.JSONDecodeError:
-            return {
-                "is_valid": False,
-                "confidence": 0.0,
-                "issues": ["Failed to parse validation response"],
-                "raw_response": response.content
-            }
+        # Complex conflicts keep the strong model for validation too
+        llm = self.llm_heavy if complexity == "complex" else self.llm_light
+        async with self._validation_semaphore:
+            return await self._complete_json(llm, messages)
     
-    async def _apply_resolution(self, state: AmendmentWorkflowState, 
-                              conflict: ConflictInfo, resolution_data: Dict) -> Dict[str, Any]:
+    def _apply_resolution(self, state: AmendmentWorkflowState, 
+                          conflict: ConflictInfo, resolution_data: Dict) -> Dict[str, Any]:
         """Apply the validated resolution to the workflow state"""
         
         try:
@@ -365,9 +641,8 @@ class ConflictResolutionNode:
                 
                 # Flag that parties need to re-review
                 for party_id in conflict.affected_parties:
-                    if party_id in state.party_responses:
-                        # Reset party status to pending for re-review
-                        state.party_responses[party_id].status = "pending_re_review"
+                    # Reset party status to pending for re-review
+                    state.update_party_status(party_id, "pending_re_review")
             
             # Update workflow metrics
             if "conflict_resolutions" not in state.node_outputs:
@@ -377,7 +652,7 @@ class ConflictResolutionNode:
                 "conflict_id": conflict.conflict_id,
                 "resolution_strategy": resolution_data.get("resolution_type", "unknown"),
                 "confidence": resolution_data.get("confidence_score", 0.5),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             })
             
             return {
@@ -397,22 +672,17 @@ class ConflictResolutionNode:
         """
         Identifies new conflicts from party responses and adds them to the state.
         """
-        # Get IDs of conflicts already processed to avoid duplication
-        existing_conflict_parties = set()
-        for conflict in state.conflicts:
-            existing_conflict_parties.update(conflict.affected_parties)
-
         for party_id, response in state.party_responses.items():
-            if party_id in existing_conflict_parties:
+            if state.has_party_conflict(party_id):
                 continue # Skip parties that are already part of a conflict
 
-            if response.status in ["rejected", "requested_changes"]:
+            if response.status in _CONFLICTING_STATUSES:
                 # Determine affected clauses from counter-proposals if they exist
-                affected_clauses = []
-                if response.proposed_changes and "proposed_modifications" in response.proposed_changes:
-                    for mod in response.proposed_changes["proposed_modifications"]:
-                        if "clause" in mod:
-                            affected_clauses.append(mod["clause"])
+                modifications = (response.proposed_changes or {}).get("proposed_modifications") or []
+                affected_clauses = [
+                    mod["clause"] for mod in modifications
+                    if isinstance(mod, dict) and "clause" in mod
+                ]
 
                 # Create a conflict description
                 description = response.comments or "No specific comments provided."
@@ -425,8 +695,7 @@ class ConflictResolutionNode:
                 severity = "medium"
                 if response.risk_assessment and "overall_risk_level" in response.risk_assessment:
                     risk_level = response.risk_assessment["overall_risk_level"]
-                    severity_map = {"high": "high", "medium": "medium", "low": "low"}
-                    severity = severity_map.get(risk_level, "medium")
+                    severity = _SEVERITY_BY_RISK_LEVEL.get(risk_level, "medium")
 
                 conflict = ConflictInfo(
                     conflict_type="unacceptable_terms" if response.status == "rejected" else "counter_proposal",
@@ -438,7 +707,10 @@ class ConflictResolutionNode:
                 )
 
                 state.add_conflict(conflict)
-                print(f"   CONFLICT DETECTED: {response.organization} {response.status} the proposal. Added conflict {conflict.conflict_id}")
+                logger.info(
+                    "   CONFLICT DETECTED: %s %s the proposal. Added conflict %s",
+                    response.organization, response.status, conflict.conflict_id
+                )
 def create_conflict_resolution_node() -> ConflictResolutionNode:
     """Factory function to create conflict resolution node"""
     return ConflictResolutionNode()
\ No newline at end of file
@@ -6,14 +6,154 @@ This node represents individual parties in the contract amendment process.
 Each party evaluates proposed changes based on their organizational policies and constraints.
 """
 
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
+from typing import Dict, List, Any, Literal, Optional
 from langchain.schema import HumanMessage, SystemMessage
-from datetime import datetime
-import json
+from langchain_core.caches import InMemoryCache
+from pydantic import BaseModel, Field
+import asyncio
+import logging
+import orjson
+import time
 
 from ..graph_state import AmendmentWorkflowState, PartyResponse
 from ..tools.contract_tools import get_contract_tools
+from ..llm import get_llm
+
+logger = logging.getLogger(__name__)
+
+# Shared tool list; the tools are stateless, so every party agent can use the same instances
+_CONTRACT_TOOLS = get_contract_tools()
+
+# Token budget for the contract clauses shown to each party
+PARTY_CONTRACT_EXCERPT_TOKENS = 1000
+
+# Prompt-keyed completion cache shared by the party clients. Re-reviews of an
+# unchanged proposal (retries, resumed workflows, repeat rounds) reuse the earlier
+# evaluation instead of calling the API again.
+PARTY_LLM_CACHE_SIZE = 4096
+_PARTY_LLM_CACHE = InMemoryCache(maxsize=PARTY_LLM_CACHE_SIZE)
+
+# Clients shared by every party agent; agents differ only in prompts, not model settings.
+# The evaluation and counter-proposals reason over the contract, so they get the
+# strong model; the evaluation is schema-validated through function calling and the
+# counter-proposals use JSON mode. The 2-3 sentence rationale is plain prose
+# and runs on the small model unless a party's policies ask for the "heavy" tier;
+# it is generated as a stream on cache misses, so its tokens reach stream_mode="messages"
+# consumers as they arrive rather than after the full completion.
+_PARTY_HEAVY_JSON_LLM = get_llm(
+    model="gpt-4-turbo-preview",
+    temperature=0.3,
+    cache=_PARTY_LLM_CACHE,
+    model_kwargs={"response_format": {"type": "json_object"}}
+)
+_PARTY_HEAVY_LLM = get_llm(model="gpt-4-turbo-preview", temperature=0.3, streaming=True, cache=_PARTY_LLM_CACHE)
+_PARTY_LIGHT_LLM = get_llm(model="gpt-4o-mini", temperature=0.3, streaming=True, cache=_PARTY_LLM_CACHE)
+
+
+# Function calling is not schema-strict, so only the scores and the tolerance
+# verdict that drive the recommendation are required; descriptive fields the
+# model leaves out fall back to empty values instead of failing validation.
+
+class ClauseImpact(BaseModel):
+    """Effect of one changed clause on the party"""
+    original_text: str = Field(default="", description="original clause")
+    proposed_text: str = Field(default="", description="new clause")
+    impact: Literal["positive", "negative", "neutral"] = "neutral"
+    reasoning: str = Field(default="", description="why this impacts us this way")
+
+
+class ContractChangeAnalysis(BaseModel):
+    """Party's reading of the proposed contract changes"""
+    changes_summary: str = Field(default="", description="brief summary of all changes")
+    favorable_changes: List[str] = Field(default_factory=list, description="changes that benefit our organization")
+    unfavorable_changes: List[str] = Field(default_factory=list, description="changes that may hurt our interests")
+    neutral_changes: List[str] = Field(default_factory=list, description="changes with minimal impact")
+    clause_by_clause_analysis: Dict[str, ClauseImpact] = Field(default_factory=dict, description="analysis keyed by clause id")
+    overall_impact_score: float = Field(description="1-10 where 10 is most favorable")
+
+
+class FinancialImpact(BaseModel):
+    """Financial effects of the changes"""
+    cost_increase: str = Field(default="", description="estimated increase/decrease")
+    revenue_impact: str = Field(default="", description="potential revenue effect")
+    cash_flow_impact: str = Field(default="", description="effect on cash flow")
+
+
+class OperationalImpact(BaseModel):
+    """Operational effects of the changes"""
+    workflow_changes: str = Field(default="", description="required operational changes")
+    resource_requirements: str = Field(default="", description="additional resources needed")
+    timeline_impact: str = Field(default="", description="effect on project timelines")
+
+
+class StrategicImpact(BaseModel):
+    """Strategic effects of the changes"""
+    alignment_with_goals: str = Field(default="", description="how well this aligns with our strategy")
+    competitive_advantage: str = Field(default="", description="competitive implications")
+    relationship_impact: str = Field(default="", description="effect on business relationships")
+
+
+class BusinessImpact(BaseModel):
+    """Business impact of the proposed changes for the party"""
+    financial_impact: FinancialImpact = Field(default_factory=FinancialImpact)
+    operational_impact: OperationalImpact = Field(default_factory=OperationalImpact)
+    strategic_impact: StrategicImpact = Field(default_factory=StrategicImpact)
+    overall_business_score: float = Field(description="1-10 where 10 is most beneficial")
+
+
+class LegalRisk(BaseModel):
+    """One legal risk and its mitigation"""
+    risk: str = Field(description="description of legal risk")
+    severity: Literal["high", "medium", "low"] = "medium"
+    mitigation: str = Field(default="", description="suggested mitigation")
+
+
+class LegalEvaluation(BaseModel):
+    """Legal and compliance aspects of the proposed changes"""
+    legal_risks: List[LegalRisk] = Field(default_factory=list)
+    compliance_issues: List[str] = Field(default_factory=list, description="any compliance concerns")
+    enforceability_concerns: List[str] = Field(default_factory=list, description="enforceability issues")
+    recommended_legal_review: str = Field(default="", description="yes/no and why")
+    legal_score: float = Field(description="1-10 where 10 is legally sound")
+
+
+class FinancialRisk(BaseModel):
+    """One financial risk and its mitigation"""
+    risk: str = Field(description="description")
+    probability: Literal["high", "medium", "low"] = "medium"
+    impact: Literal["high", "medium", "low"] = "medium"
+    mitigation: str = Field(default="", description="how to mitigate")
+
+
+class RiskAssessment(BaseModel):
+    """Risk assessment of the proposed changes against the party's tolerance"""
+    financial_risks: List[FinancialRisk] = Field(default_factory=list)
+    operational_risks: List[str] = Field(default_factory=list, description="operational risk descriptions")
+    reputational_risks: List[str] = Field(default_factory=list, description="reputational risk descriptions")
+    strategic_risks: List[str] = Field(default_factory=list, description="strategic risk descriptions")
+    overall_risk_level: Literal["high", "medium", "low"] = "medium"
+    risk_score: float = Field(description="1-10 where 1 is highest risk")
+    acceptable_given_tolerance: Literal["yes", "no"] = Field(description="based on our risk tolerance")
+
+
+class PartyEvaluation(BaseModel):
+    """Contract, business, legal and risk analyses of an amendment proposal"""
+    contract_analysis: ContractChangeAnalysis
+    business_impact: BusinessImpact
+    legal_evaluation: LegalEvaluation
+    risk_assessment: RiskAssessment
+
+
+_PARTY_EVALUATOR = _PARTY_HEAVY_LLM.with_structured_output(PartyEvaluation, method="function_calling")
+
+
+def _normalize_clause(name: str) -> str:
+    return str(name).replace("_", " ").strip().lower()
+
+
+def _dumps_indent(data: Any) -> str:
+    """Indented, key-sorted JSON for prompt text, byte-stable for equal data"""
+    return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
 
 
 class PartyAgentNode:
@@ -25,32 +165,52 @@ class PartyAgentNode:
         self.party_id = party_id
         self.organization = organization
         self.policies = policies
-        self.llm = ChatOpenAI(model="gpt-4-turbo-preview", temperature=0.3)
-        self.tools = get_contract_tools()
+        self.llm_heavy = _PARTY_HEAVY_JSON_LLM
+        self.evaluator = _PARTY_EVALUATOR
+        model_tier = policies.get("model_tier", "auto")
+        self.llm_light = _PARTY_HEAVY_LLM if model_tier == "heavy" else _PARTY_LIGHT_LLM
+        self.tools = _CONTRACT_TOOLS
+        # Party agents run concurrently, so every record carries the party it came from
+        self._log = logging.LoggerAdapter(logger, {"party_id": party_id, "organization": organization})
         
         # Load organization-specific constraints and preferences
         self.constraints = self._load_organizational_constraints()
         self.risk_tolerance = policies.get("risk_tolerance", "medium")
         self.approval_authority = policies.get("approval_authority", "standard")
+        
+        # Policies, constraints and the organization name are fixed for the agent's
+        # lifetime, so their prompt text is built once here rather than per call
+        self._policies_json = _dumps_indent(self.policies)
+        self._constraints_json = _dumps_indent(self.constraints)
+        self._evaluation_system = SystemMessage(content=(
+            f"You are a multi-disciplinary analyst representing {organization}'s interests; "
+            "produce contract, business, legal and risk analyses."
+        ))
+        self._rationale_system = SystemMessage(content=f"You are writing on behalf of {organization}.")
+        self._negotiation_system = SystemMessage(content=f"You are negotiating on behalf of {organization}.")
+        # Normalized prohibited clause names for the pre-LLM constraint check
+        self._prohibited_clauses = {
+            _normalize_clause(clause): clause for clause in self.constraints["prohibited_clauses"]
+        }
     
     async def __call__(self, state: AmendmentWorkflowState) -> Dict[str, Any]:
         """
         Evaluate amendment proposal from this party's perspective
         """
-        print(f"🏢 PARTY AGENT ({self.organization}): Evaluating amendment {state.amendment_id}")
+        self._log.info("🏢 PARTY AGENT (%s): Evaluating amendment %s", self.organization, state.amendment_id)
         
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         
         try:
             # Check if this party has already responded
             if self.party_id in state.party_responses:
                 existing_response = state.party_responses[self.party_id]
                 if existing_response.status != "pending":
-                    print(f"   Already responded with status: {existing_response.status}")
+                    self._log.info("   %s already responded with status: %s", self.organization, existing_response.status)
                     return {"action": "no_action_needed", "reason": "already_responded"}
             
-            # Evaluate the proposed changes
-            evaluation_result = await self._evaluate_amendment_proposal(state)
+            # Evaluate the proposed changes, unless a hard constraint already rules them out
+            evaluation_result = self._fast_reject(state) or await self._evaluate_amendment_proposal(state)
             
             party_response = PartyResponse(
                 party_id=self.party_id,
@@ -67,7 +227,7 @@ class PartyAgentNode:
 
             
             # Log execution
-            duration = (datetime.utcnow() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             state.log_execution(
                 f"party_agent_{self.party_id}", 
                 {"amendment_id": state.amendment_id}, 
@@ -76,7 +236,7 @@ class PartyAgentNode:
                 True
             )
             
-            print(f"   Decision: {evaluation_result['recommendation']}")
+            self._log.info("   %s decision: %s", self.organization, evaluation_result['recommendation'])
             
             return {
                 "party_id": self.party_id,
@@ -86,6 +246,7 @@ class PartyAgentNode:
             }
             
         except Exception as e:
+            self._log.warning("   %s evaluation failed: %s", self.organization, e)
             error_response = PartyResponse(
                 party_id=self.party_id,
                 organization=self.organization,
@@ -94,7 +255,7 @@ class PartyAgentNode:
             )
             state.add_party_response(self.party_id, error_response)
             
-            duration = (datetime.utcnow() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             state.log_execution(
                 f"party_agent_{self.party_id}", 
                 {"amendment_id": state.amendment_id}, 
@@ -105,32 +266,65 @@ class PartyAgentNode:
             
             return {"error": str(e), "party_id": self.party_id}
     
+    def _fast_reject(self, state: AmendmentWorkflowState) -> Optional[Dict[str, Any]]:
+        """
+        Reject without any LLM call when the proposal touches a prohibited clause or
+        names an amount above the budget limit; None when the full evaluation is needed
+        """
+        budget_limit = self.constraints["budget_limit"]
+        
+        for clause, change in state.proposed_changes.items():
+            # Only the clause key or an explicit clause_id identifies a prohibited
+            # clause; free text may merely mention one (e.g. to remove it), so it is
+            # left to the full evaluation
+            clause_ids = [clause]
+            if isinstance(change, dict):
+                amount = change.get("amount")
+                if isinstance(amount, (int, float)) and amount > budget_limit:
+                    return self._rejection(f"Change to {clause} exceeds our budget limit of {budget_limit}")
+                if change.get("clause_id"):
+                    clause_ids.append(change["clause_id"])
+            
+            prohibited = next(
+                (self._prohibited_clauses[key] for key in map(_normalize_clause, clause_ids)
+                 if key in self._prohibited_clauses),
+                None
+            )
+            if prohibited is not None:
+                return self._rejection(f"Prohibited clause {prohibited} included in change to {clause}")
+        
+        return None
+    
+    def _rejection(self, reason: str) -> Dict[str, Any]:
+        return {
+            "recommendation": "rejected",
+            "confidence": 1.0,
+            "comments": f"{self.organization} cannot accept this amendment: {reason}.",
+            "counter_proposals": None,
+            "conditions": None,
+            "risk_assessment": {"overall_risk_level": "high"},
+            "analysis_details": {"constraint_violation": reason}
+        }
+    
     async def _evaluate_amendment_proposal(self, state: AmendmentWorkflowState) -> Dict[str, Any]:
         """
         Comprehensive evaluation of the amendment proposal
         """
         
-        # Prepare evaluation context
+        # Prepare evaluation context. Both entries are memoized on the state, so every
+        # party reviewing the same state shares them; policies, constraints and risk
+        # tolerance are per-agent and already prepared in __init__.
         evaluation_context = {
-            "original_contract": state.original_contract,
-            "proposed_changes": state.proposed_changes,
-            "other_parties": [p for p in state.parties if p != self.party_id],
-            "organizational_policies": self.policies,
-            "constraints": self.constraints,
-            "risk_tolerance": self.risk_tolerance
+            "contract_excerpt": state.relevant_contract_excerpt(PARTY_CONTRACT_EXCERPT_TOKENS),
+            "proposed_changes_json": state.proposed_changes_json()
         }
         
-        # Analyze contract changes
-        contract_analysis = await self._analyze_contract_changes(evaluation_context)
-        
-        # Assess business impact
-        business_impact = await self._assess_business_impact(evaluation_context)
-        
-        # Evaluate legal and compliance aspects
-        legal_evaluation = await self._evaluate_legal_aspects(evaluation_context)
-        
-        # Generate risk assessment
-        risk_assessment = await self._assess_risks(evaluation_context)
+        # One call covers all four analyses so the shared context is sent once
+        aspects = await self._evaluate_all_aspects(evaluation_context)
+        contract_analysis = aspects["contract_analysis"]
+        business_impact = aspects["business_impact"]
+        legal_evaluation = aspects["legal_evaluation"]
+        risk_assessment = aspects["risk_assessment"]
         
         # Make final recommendation
         recommendation = await self._make_recommendation(
@@ -160,173 +354,32 @@ class PartyAgentNode:
         #     "analysis_details": None
         # }
     
-    async def _analyze_contract_changes(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze the specific contract changes proposed"""
-        
-        analysis_prompt = f"""
-        As a representative of {self.organization}, analyze these proposed contract changes:
+    async def _evaluate_all_aspects(self, context: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Contract, business, legal and risk analysis of the proposed changes in a single call"""
         
-        Original Contract: {context['original_contract'][:1500] if context['original_contract'] else 'Not provided'}
+        evaluation_prompt = f"""
+        As a representative of {self.organization}, evaluate these proposed contract changes:
         
-        Proposed Changes: {json.dumps(context['proposed_changes'], indent=2)}
+        Original Contract: {context['contract_excerpt'] or 'Not provided'}
         
-        Organization Policies: {json.dumps(self.policies, indent=2)}
+        Proposed Changes: {context['proposed_changes_json']}
         
-        Analyze the changes and return JSON:
-        {{
-            "changes_summary": "brief summary of all changes",
-            "favorable_changes": ["changes that benefit our organization"],
-            "unfavorable_changes": ["changes that may hurt our interests"],
-            "neutral_changes": ["changes with minimal impact"],
-            "clause_by_clause_analysis": {{
-                "clause_id": {{
-                    "original_text": "original clause",
-                    "proposed_text": "new clause",
-                    "impact": "positive/negative/neutral",
-                    "reasoning": "why this impacts us this way"
-                }}
-            }},
-            "overall_impact_score": "1-10 where 10 is most favorable"
-        }}
-        """
+        Organization Policies: {self._policies_json}
         
-        messages = [
-            SystemMessage(content=f"You are a contract analyst representing {self.organization}'s interests."),
-            HumanMessage(content=analysis_prompt)
-        ]
-        
-        response = await self.llm.ainvoke(messages)
-        
-        try:
-            return json.loads(response.content)
-        except json.JSONDecodeError:
-            return {"raw_analysis": response.content, "parse_error": True}
-    
-    async def _assess_business_impact(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Assess business impact of proposed changes"""
-        
-        impact_prompt = f"""
-        Assess the business impact of these contract changes for {self.organization}:
-        
-        Proposed Changes: {json.dumps(context['proposed_changes'], indent=2)}
-        
-        Our Business Constraints: {json.dumps(self.constraints, indent=2)}
-        Risk Tolerance: {self.risk_tolerance}
-        
-        Evaluate and return JSON:
-        {{
-            "financial_impact": {{
-                "cost_increase": "estimated increase/decrease",
-                "revenue_impact": "potential revenue effect",
-                "cash_flow_impact": "effect on cash flow"
-            }},
-            "operational_impact": {{
-                "workflow_changes": "required operational changes",
-                "resource_requirements": "additional resources needed",
-                "timeline_impact": "effect on project timelines"
-            }},
-            "strategic_impact": {{
-                "alignment_with_goals": "how well this aligns with our strategy",
-                "competitive_advantage": "competitive implications",
-                "relationship_impact": "effect on business relationships"
-            }},
-            "overall_business_score": "1-10 where 10 is most beneficial"
-        }}
-        """
-        
-        messages = [
-            SystemMessage(content=f"You are a business analyst for {self.organization}."),
-            HumanMessage(content=impact_prompt)
-        ]
-        
-        response = await self.llm.ainvoke(messages)
-        
-        try:
-            return json.loads(response.content)
-        except json.JSONDecodeError:
-            return {"raw_impact": response.content, "parse_error": True}
-    
-    async def _evaluate_legal_aspects(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Evaluate legal and compliance aspects"""
-        
-        legal_prompt = f"""
-        Evaluate legal aspects of these contract changes for {self.organization}:
-        
-        Proposed Changes: {json.dumps(context['proposed_changes'], indent=2)}
-        
-        Consider:
-        - Legal risks and liabilities
-        - Compliance requirements
-        - Enforceability issues
-        - Regulatory implications
-        
-        Return JSON:
-        {{
-            "legal_risks": [
-                {{
-                    "risk": "description of legal risk",
-                    "severity": "high/medium/low",
-                    "mitigation": "suggested mitigation"
-                }}
-            ],
-            "compliance_issues": ["any compliance concerns"],
-            "enforceability_concerns": ["enforceability issues"],
-            "recommended_legal_review": "yes/no and why",
-            "legal_score": "1-10 where 10 is legally sound"
-        }}
-        """
-        
-        messages = [
-            SystemMessage(content="You are a legal analyst specializing in contract law."),
-            HumanMessage(content=legal_prompt)
-        ]
-        
-        response = await self.llm.ainvoke(messages)
-        
-        try:
-            return json.loads(response.content)
-        except json.JSONDecodeError:
-            return {"raw_legal": response.content, "parse_error": True}
-    
-    async def _assess_risks(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Comprehensive risk assessment"""
-        
-        risk_prompt = f"""
-        Perform comprehensive risk assessment for {self.organization}:
-        
-        Proposed Changes: {json.dumps(context['proposed_changes'], indent=2)}
+        Our Business Constraints: {self._constraints_json}
         Risk Tolerance: {self.risk_tolerance}
         
-        Assess all types of risks and return JSON:
-        {{
-            "financial_risks": [
-                {{
-                    "risk": "description",
-                    "probability": "high/medium/low",
-                    "impact": "high/medium/low",
-                    "mitigation": "how to mitigate"
-                }}
-            ],
-            "operational_risks": ["operational risk descriptions"],
-            "reputational_risks": ["reputational risk descriptions"],
-            "strategic_risks": ["strategic risk descriptions"],
-            "overall_risk_level": "high/medium/low",
-            "risk_score": "1-10 where 1 is highest risk",
-            "acceptable_given_tolerance": "yes/no based on our risk tolerance"
-        }}
+        For the legal evaluation consider legal risks and liabilities, compliance
+        requirements, enforceability issues and regulatory implications.
         """
         
         messages = [
-            SystemMessage(content=f"You are a risk analyst for {self.organization}."),
-            HumanMessage(content=risk_prompt)
+            self._evaluation_system,
+            HumanMessage(content=evaluation_prompt)
         ]
         
-        response = await self.llm.ainvoke(messages)
-        
-        try:
-            return json.loads(response.content)
-        except json.JSONDecodeError:
-            return {"raw_risk": response.content, "parse_error": True}
+        evaluation = await self.evaluator.ainvoke(messages)
+        return evaluation.model_dump()
     
     async def _make_recommendation(self, contract_analysis: Dict, business_impact: Dict, 
                                   legal_evaluation: Dict, risk_assessment: Dict) -> Dict[str, Any]:
@@ -387,11 +440,19 @@ class PartyAgentNode:
         """
         
         messages = [
-            SystemMessage(content=f"You are writing on behalf of {self.organization}."),
+            self._rationale_system,
             HumanMessage(content=rationale_prompt)
         ]
         
-        rationale_response = await self.llm.ainvoke(messages)
+        # Counter-proposals depend only on the analyses, not on the rationale,
+        # so when changes are requested both are generated concurrently
+        if decision == "requested_changes":
+            rationale_response, counter_proposals = await asyncio.gather(
+                self.llm_light.ainvoke(messages),
+                self._generate_counter_proposals(contract_analysis, business_impact)
+            )
+        else:
+            rationale_response = await self.llm_light.ainvoke(messages)
         
         result = {
             "decision": decision,
@@ -402,9 +463,7 @@ class PartyAgentNode:
         
         # Add counter-proposals if requesting changes
         if decision == "requested_changes":
-            result["counter_proposals"] = await self._generate_counter_proposals(
-                contract_analysis, business_impact
-            )
+            result["counter_proposals"] = counter_proposals
         
         return result
     
@@ -435,15 +494,15 @@ class PartyAgentNode:
         """
         
         messages = [
-            SystemMessage(content=f"You are negotiating on behalf of {self.organization}."),
+            self._negotiation_system,
             HumanMessage(content=counter_prompt)
         ]
         
-        response = await self.llm.ainvoke(messages)
+        response = await self.llm_heavy.ainvoke(messages)
         
         try:
-            return json.loads(response.content)
-        except json.JSONDecodeError:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
             return {"raw_counter_proposals": response.content}
     
     def _load_organizational_constraints(self) -> Dict[str, Any]:
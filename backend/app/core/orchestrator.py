@@ -6,18 +6,106 @@ This module creates and manages the LangGraph workflow that orchestrates
 the entire multi-party contract amendment process.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
+from collections import OrderedDict
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
-from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, Field
 import asyncio
 from datetime import datetime, timedelta, timezone
+import hashlib
+import logging
+import orjson
+import os
 
-from .graph_state import AmendmentWorkflowState, AmendmentStatus
+from .graph_state import AmendmentWorkflowState, AmendmentStatus, DocumentVersion
+from .llm import get_llm
 from .nodes.party_node import PartyAgentNode
 from langchain_core.messages import SystemMessage, HumanMessage
-import json
+from langchain_core.caches import InMemoryCache
 from .nodes.conflict_resolution_node import ConflictResolutionNode
+from .tools.contract_tools import CONTRACT_TOOLS
+
+logger = logging.getLogger(__name__)
+
+# Tools are stateless singletons; resolve them once instead of per node run
+_COMPLIANCE_TOOL = CONTRACT_TOOLS["check_compliance"]
+_MERGE_TOOL = CONTRACT_TOOLS["merge_amendments"]
+
+# Per-request timeout and retry budget for initiation-time analysis, plus an
+# overall ceiling so a stalled API falls back instead of holding the workflow
+CONTEXT_ANALYSIS_REQUEST_TIMEOUT = 15
+CONTEXT_ANALYSIS_MAX_RETRIES = 3
+CONTEXT_ANALYSIS_TIMEOUT = 45
+# Contract text sent with the analysis: the clauses being amended, or the start
+# of the contract when none are named in it
+CONTEXT_ANALYSIS_EXCERPT_TOKENS = 500
+
+# Workflow threads whose checkpoints are kept in memory
+MAX_CHECKPOINT_THREADS = 1024
+
+# Party agents reviewing at once, across all workflows; keeps bursts of party
+# evaluations under the OpenAI rate limit
+PARTY_REVIEW_CONCURRENCY = int(os.getenv("PARTY_CONCURRENCY", "8"))
+
+# Distinct (party, organization, policies) agents kept for reuse across workflows
+MAX_PARTY_AGENTS = 256
+
+
+@lru_cache(maxsize=MAX_PARTY_AGENTS)
+def _get_party_agent(party_id: str, organization: str, policies_key: bytes) -> PartyAgentNode:
+    """Party agent for a party/policy combination, built once and shared by its workflows"""
+    return PartyAgentNode(party_id, organization, orjson.loads(policies_key))
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    return str(value)
+
+
+def _jsonable(value: Any) -> Any:
+    """Plain JSON types for a node's state update (models, dataclasses, datetimes, enums)"""
+    return orjson.loads(orjson.dumps(value, default=_encode_default, option=orjson.OPT_NON_STR_KEYS))
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    In-memory checkpointer that keeps at most maxsize workflow threads, dropping the
+    least recently checkpointed thread once the limit is exceeded
+    """
+    
+    def __init__(self, maxsize: int = MAX_CHECKPOINT_THREADS, **kwargs):
+        super().__init__(**kwargs)
+        self.maxsize = maxsize
+        self._thread_order: OrderedDict[str, None] = OrderedDict()
+    
+    def put(self, config, checkpoint, metadata, new_versions):
+        # aput delegates here, so both the sync and async paths are bounded
+        saved = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        self._thread_order[thread_id] = None
+        self._thread_order.move_to_end(thread_id)
+        while len(self._thread_order) > self.maxsize:
+            evicted, _ = self._thread_order.popitem(last=False)
+            self.delete_thread(evicted)
+        return saved
+    
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        self._thread_order.pop(thread_id, None)
+
+
+class ContractContextAnalysis(BaseModel):
+    """Initiation-time analysis of the contract and its proposed amendments"""
+    contract_type: str = Field(description="type of contract")
+    complexity_indicators: List[str] = Field(description="factors that make this complex")
+    complexity_score: int = Field(description="overall amendment complexity from 1 (simple) to 10 (highly complex)")
+    amendment_areas: List[str] = Field(description="areas being modified")
+    potential_risks: List[str] = Field(description="risks to watch for")
+    stakeholder_impact: Dict[str, str] = Field(description="impact description for each party")
+    recommended_review_time: str = Field(description="estimated time needed")
 
 class ContractAmendmentOrchestrator:
     """
@@ -25,10 +113,24 @@ class ContractAmendmentOrchestrator:
     """
     
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4-turbo-preview", temperature=0.1)
-        self.memory = MemorySaver()
+        # Deterministic and cached: repeat analyses of the same contract and changes
+        # (retries, resumed workflows, shared templates) skip the API call. Cache
+        # misses are generated as a stream; the analysis is a structured-output
+        # call, so it arrives as tool-call argument deltas, which stream_amendment
+        # forwards as "arguments" events.
+        self.llm = get_llm(
+            model="gpt-4-turbo-preview",
+            temperature=0,
+            streaming=True,
+            cache=InMemoryCache(maxsize=256),
+            timeout=CONTEXT_ANALYSIS_REQUEST_TIMEOUT,
+            max_retries=CONTEXT_ANALYSIS_MAX_RETRIES
+        )
+        self.context_analyzer = self.llm.with_structured_output(ContractContextAnalysis, method="function_calling")
+        self.memory = BoundedMemorySaver()
         self.workflow = None
         self.party_agents: Dict[str, PartyAgentNode] = {}
+        self._party_semaphore = asyncio.Semaphore(PARTY_REVIEW_CONCURRENCY)
         self._build_workflow()
     
     def _build_workflow(self):
@@ -57,9 +159,11 @@ class ContractAmendmentOrchestrator:
         workflow.add_edge("party_notified", "party_review")
         workflow.add_edge("party_review", "conflict_resolution")
         # workflow.add_edge("conflict_resolution", "consensus_building")
+        # Legal review and version control are independent, so they run in the
+        # same superstep; final approval waits for both
         workflow.add_edge("conflict_resolution", "legal_review")
-        workflow.add_edge("legal_review", "version_control")
-        workflow.add_edge("version_control", "final_approval")
+        workflow.add_edge("conflict_resolution", "version_control")
+        workflow.add_edge(["legal_review", "version_control"], "final_approval")
         workflow.add_edge("final_approval", "completion")
         workflow.add_edge("completion", END)
         workflow.add_edge("error_handler", END)
@@ -67,6 +171,46 @@ class ContractAmendmentOrchestrator:
         # Compile the workflow
         self.workflow = workflow.compile(checkpointer=self.memory)
     
+    def _prepare_workflow(self,
+                          workflow_id: str,
+                          contract_id: str,
+                          parties: List[Dict[str, Any]],
+                          proposed_changes: Dict[str, Any],
+                          original_contract: Optional[str] = None,
+                          workflow_config: Optional[Dict[str, Any]] = None) -> AmendmentWorkflowState:
+        """Register the party agents and build the initial workflow state"""
+        
+        # Create party agents
+        for party_info in parties:
+            party_id = party_info["id"]
+            organization = party_info["organization"] 
+            policies = party_info.get("policies", {})
+            # Canonical policies as the cache key: equal policies give the same agent
+            policies_key = orjson.dumps(policies, default=str, option=orjson.OPT_SORT_KEYS)
+            
+            self.party_agents[party_id] = _get_party_agent(party_id, organization, policies_key)
+        
+        # Create initial state
+        initial_state = AmendmentWorkflowState(
+            workflow_id=workflow_id,
+            contract_id=contract_id,
+            parties=[p["id"] for p in parties],
+            proposed_changes=proposed_changes,
+            original_contract=original_contract,
+            status=AmendmentStatus.INITIATED
+        )
+        
+        if workflow_config:
+            initial_state.workflow_config.update(workflow_config)
+        
+        logger.info(
+            "🚀 Initiating amendment workflow %s - Contract: %s, Parties: %s, Changes: %d proposed changes",
+            initial_state.workflow_id, contract_id,
+            [p['organization'] for p in parties], len(proposed_changes)
+        )
+        
+        return initial_state
+    
     async def initiate_amendment(self, 
                                workflow_id: str,
                                contract_id: str,
@@ -88,50 +232,83 @@ class ContractAmendmentOrchestrator:
             workflow_id: ID of the initiated workflow
         """
         
-        # Create party agents
-        for party_info in parties:
-            party_id = party_info["id"]
-            organization = party_info["organization"] 
-            policies = party_info.get("policies", {})
-            
-            self.party_agents[party_id] = PartyAgentNode(party_id, organization, policies)
-        
-        # Create initial state
-        initial_state = AmendmentWorkflowState(
-            workflow_id=workflow_id,
-            contract_id=contract_id,
-            parties=[p["id"] for p in parties],
-            proposed_changes=proposed_changes,
-            original_contract=original_contract,
-            status=AmendmentStatus.INITIATED
+        initial_state = self._prepare_workflow(
+            workflow_id, contract_id, parties, proposed_changes, original_contract, workflow_config
         )
         
-        if workflow_config:
-            initial_state.workflow_config.update(workflow_config)
-        
-        print(f"🚀 Initiating amendment workflow {initial_state.workflow_id}")
-        print(f"   Contract: {contract_id}")
-        print(f"   Parties: {[p['organization'] for p in parties]}")
-        print(f"   Changes: {len(proposed_changes)} proposed changes")
-        
         # Run the workflow
         config = {"configurable": {"thread_id": initial_state.workflow_id}}
         
         try:
-            async for output in self.workflow.astream(initial_state.to_dict(), config):
+            # The state model is handed to the graph as-is: its fields seed the
+            # channels directly, with no JSON dump and re-validation on the way in.
+            async for output in self.workflow.astream(initial_state, config):
                 # Log intermediate outputs
-                for node_name, node_output in output.items():
-                    print(f"   ✅ {node_name}: {node_output.get('action', 'processed')}")
-                    
-                    # Update party responses if this was a party node
-                    if node_name == "party_review" and "party_responses" in node_output:
-                        for party_id, response in node_output["party_responses"].items():
-                            initial_state.add_party_response(party_id, response)
+                if logger.isEnabledFor(logging.DEBUG):
+                    for node_name, node_output in output.items():
+                        logger.debug("   ✅ %s: %s", node_name, (node_output or {}).get('action', 'processed'))
         except Exception as e:
-            print(f"   ❌ Workflow error: {str(e)}")
+            logger.error("   ❌ Workflow error: %s", e)
             raise
+    
+    
+    async def stream_amendment(self,
+                               workflow_id: str,
+                               contract_id: str,
+                               parties: List[Dict[str, Any]],
+                               proposed_changes: Dict[str, Any],
+                               original_contract: Optional[str] = None,
+                               workflow_config: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a new contract amendment workflow, yielding JSON-safe events as it runs.
+        Takes the same arguments as initiate_amendment.
+        
+        Events are {"workflow_id", "type": "token", "node", "content"} for each chunk
+        of LLM text streamed inside a node, {"workflow_id", "type": "arguments",
+        "node", "content"} for each fragment of a structured-output (JSON) answer,
+        and {"workflow_id", "type": "node", "node", "output"} with the node's state
+        update once it finishes.
+        """
         
+        initial_state = self._prepare_workflow(
+            workflow_id, contract_id, parties, proposed_changes, original_contract, workflow_config
+        )
+        config = {"configurable": {"thread_id": initial_state.workflow_id}}
         
+        try:
+            async for mode, chunk in self.workflow.astream(initial_state, config, stream_mode=["updates", "messages"]):
+                if mode == "messages":
+                    message, metadata = chunk
+                    if isinstance(message.content, str) and message.content:
+                        yield {
+                            "workflow_id": initial_state.workflow_id,
+                            "type": "token",
+                            "node": metadata.get("langgraph_node"),
+                            "content": message.content
+                        }
+                    # Structured-output calls (context analysis, party evaluation)
+                    # stream their answer as tool-call argument fragments instead
+                    arguments = "".join(
+                        tool_chunk.get("args") or "" for tool_chunk in getattr(message, "tool_call_chunks", ())
+                    )
+                    if arguments:
+                        yield {
+                            "workflow_id": initial_state.workflow_id,
+                            "type": "arguments",
+                            "node": metadata.get("langgraph_node"),
+                            "content": arguments
+                        }
+                    continue
+                for node_name, node_output in chunk.items():
+                    yield {
+                        "workflow_id": initial_state.workflow_id,
+                        "type": "node",
+                        "node": node_name,
+                        "output": _jsonable(node_output)
+                    }
+        except Exception as e:
+            logger.error("   ❌ Workflow error: %s", e)
+            raise
     
     async def get_workflow_status(self, workflow_id: str) -> Dict[str, Any]:
         """Get current status of a workflow"""
@@ -142,18 +319,20 @@ class ContractAmendmentOrchestrator:
             # Get the latest state
             state_snapshot = self.workflow.get_state(config)
             if state_snapshot and state_snapshot.values:
-                current_state = AmendmentWorkflowState.from_dict(state_snapshot.values)
+                # Checkpointed channel values are already typed, so read the few
+                # fields reported here instead of re-validating the whole state.
+                values = state_snapshot.values
                 
                 return {
                     "workflow_id": workflow_id,
-                    "status": current_state.status,
+                    "status": values["status"],
                     "parties_status": {
                         party_id: response.status 
-                        for party_id, response in current_state.party_responses.items()
+                        for party_id, response in values.get("party_responses", {}).items()
                     },
-                    "conflicts": len(current_state.active_conflicts),
-                    "created_at": current_state.created_at.isoformat(),
-                    "updated_at": current_state.updated_at.isoformat(),
+                    "conflicts": len(values.get("active_conflicts", [])),
+                    "created_at": values["created_at"],
+                    "updated_at": values["updated_at"],
                     # "estimated_completion": current_state.metrics.estimated_completion.isoformat() if current_state.metrics.estimated_completion else None
                 }
         except Exception as e:
@@ -172,23 +351,22 @@ class ContractAmendmentOrchestrator:
             if not state_snapshot or not state_snapshot.values:
                 return False
             
-            current_state = AmendmentWorkflowState.from_dict(state_snapshot.values)
-            
-            # Apply updates if provided
+            # Apply updates if provided, as a partial write to the checkpoint
             if updates:
-                for key, value in updates.items():
-                    if hasattr(current_state, key):
-                        setattr(current_state, key, value)
+                known = {key: value for key, value in updates.items()
+                         if key in AmendmentWorkflowState.model_fields}
+                if known:
+                    self.workflow.update_state(config, known)
             
             # Resume workflow
             async for output in self.workflow.astream(None, config):
                 for node_name, node_output in output.items():
-                    print(f"   🔄 {node_name}: {node_output.get('action', 'processed')}")
+                    logger.info("   🔄 %s: %s", node_name, (node_output or {}).get('action', 'processed'))
             
             return True
             
         except Exception as e:
-            print(f"Resume error: {str(e)}")
+            logger.error("Resume error: %s", e)
             return False
     
     # Node implementations
@@ -201,7 +379,7 @@ class ContractAmendmentOrchestrator:
     async def _initiator_node(self, state: AmendmentWorkflowState) -> AmendmentWorkflowState:
 
         """Handle workflow initiation"""
-        print("📋 Handling workflow initiation...")
+        logger.info("📋 Handling workflow initiation...")
         
         # Validate that we have all required information
         if not state.parties:
@@ -211,15 +389,19 @@ class ContractAmendmentOrchestrator:
             return {"error": "No proposed changes specified"}
         
         # Analyze the original contract if provided
+        outputs = {}
         if state.original_contract:
-            analysis_result = await self._analyze_contract_context(state)
-            state.node_outputs["contract_analysis"] = analysis_result
+            outputs["contract_analysis"] = await self._analyze_contract_context(state)
         
         # Set up party notification requirements
-        state.required_approvals = state.parties.copy()
+        state.required_approvals = tuple(state.parties)
         
-        # Update status and determine next step
-        state.update_status(AmendmentStatus.PARTIES_NOTIFIED, "Workflow initiated, moving to party notification")
+        # Update status and record the analysis in one step
+        state.update_status(
+            AmendmentStatus.PARTIES_NOTIFIED,
+            "Workflow initiated, moving to party notification",
+            outputs=outputs
+        )
         
         return state
 
@@ -234,28 +416,18 @@ class ContractAmendmentOrchestrator:
     async def _analyze_contract_context(self, state: AmendmentWorkflowState) -> Dict[str, Any]:
         """Analyze the original contract to understand context"""
         analysis_prompt = f"""
-        Analyze this contract to understand the context for proposed amendments:
+        Analyze this contract to understand the context for proposed amendments,
+        and rate the overall complexity of the amendments from 1-10 considering
+        legal complexity, business impact, implementation difficulty and risk level.
         
         Original Contract:
-        {state.original_contract[:2000]}...
+        {state.relevant_contract_excerpt(CONTEXT_ANALYSIS_EXCERPT_TOKENS)}
         
         Proposed Changes:
-        {json.dumps(state.proposed_changes, indent=2)}
+        {state.proposed_changes_json()}
         
         Parties Involved:
         {state.parties}
-        
-        Provide analysis in JSON format:
-        {{
-            "contract_type": "type of contract",
-            "complexity_indicators": ["factors that make this complex"],
-            "amendment_areas": ["areas being modified"],
-            "potential_risks": ["risks to watch for"],
-            "stakeholder_impact": {{
-                "party": "impact description"
-            }},
-            "recommended_review_time": "estimated time needed"
-        }}
         """
         
         messages = [
@@ -263,12 +435,18 @@ class ContractAmendmentOrchestrator:
             HumanMessage(content=analysis_prompt)
         ]
         
-        response = await self.llm.ainvoke(messages)
-        
         try:
-            return json.loads(response.content)
-        except json.JSONDecodeError:
-            return {"raw_analysis": response.content}
+            analysis = await asyncio.wait_for(
+                self.context_analyzer.ainvoke(messages),
+                timeout=CONTEXT_ANALYSIS_TIMEOUT
+            )
+            return analysis.model_dump()
+        except asyncio.TimeoutError:
+            logger.warning("Contract context analysis timed out after %ss", CONTEXT_ANALYSIS_TIMEOUT)
+            return {"error": "Contract context analysis timed out"}
+        except Exception as e:
+            logger.warning("Error analyzing contract context: %s", e)
+            return {"error": str(e)}
     
     # async def _assess_workflow_complexity(self, state: AmendmentWorkflowState) -> float:
     #     """Assess the complexity of the amendment workflow"""
@@ -315,36 +493,48 @@ class ContractAmendmentOrchestrator:
     async def _party_review_node(self, state: AmendmentWorkflowState) -> AmendmentWorkflowState:
         """Party review node - coordinates all party agents"""
         state.review_rounds += 1
-        print(f"👥 PARTY REVIEW (Round {state.review_rounds}): Processing {len(state.parties)} parties")
+        logger.info("👥 PARTY REVIEW (Round %d): Processing %d parties", state.review_rounds, len(state.parties))
 
         # Check if the number of review rounds has exceeded the maximum
         max_rounds = state.workflow_config.get("max_review_rounds", 2)
         if state.review_rounds > max_rounds:
-            print(f"   ❌ ERROR: Maximum review rounds ({max_rounds}) exceeded.")
-            state.errors.append({"node": "party_review", "error": "Maximum review rounds exceeded."})
+            logger.error("   ❌ ERROR: Maximum review rounds (%d) exceeded.", max_rounds)
+            state.add_error({"node": "party_review", "error": "Maximum review rounds exceeded."})
             state.update_status(AmendmentStatus.FAILED, notes="Consensus could not be reached within the allowed number of rounds.")
             return state
 
         pending_parties = state.get_pending_parties() if hasattr(state, "get_pending_parties") else state.parties
-        print(f"   Pending parties: {pending_parties}")
-        # Run all party agents concurrently
-        party_tasks = []
-        for party_id in pending_parties:
-            if party_id in self.party_agents:
-                party_agent = self.party_agents[party_id]
-                task = party_agent(state)
-                party_tasks.append(task)
-        
-        if party_tasks:
-            # Wait for all parties to respond
-            party_results = await asyncio.gather(*party_tasks, return_exceptions=True)
-            
-            # Process results
-            for i, result in enumerate(party_results):
-                if isinstance(result, Exception):
-                    print(f"   ❌ Party {state.parties[i]} error: {str(result)}")
-                else:
-                    print(f"   ✅ Party {result.get('organization', 'Unknown')}: {result.get('decision', 'No decision')}")
+        logger.info("   Pending parties: %s", pending_parties)
+        # Run party agents concurrently, bounded by the shared semaphore, and
+        # report each decision as soon as it arrives
+        async def review(party_id: str):
+            async with self._party_semaphore:
+                try:
+                    return party_id, await self.party_agents[party_id](state)
+                except Exception as e:
+                    return party_id, e
+        
+        party_tasks = [
+            asyncio.create_task(review(party_id))
+            for party_id in pending_parties if party_id in self.party_agents
+        ]
+        early_abort = state.workflow_config.get("early_abort_on_rejection", False)
+        for finished in asyncio.as_completed(party_tasks):
+            party_id, result = await finished
+            if isinstance(result, Exception):
+                logger.error("   ❌ Party %s error: %s", party_id, result)
+                continue
+            logger.info("   ✅ Party %s: %s", result.get('organization', 'Unknown'), result.get('decision', 'No decision'))
+            # A rejection already rules out consensus this round, so the remaining
+            # reviews can be dropped rather than paid for
+            if early_abort and result.get("decision") == "rejected":
+                pending = [task for task in party_tasks if not task.done()]
+                if pending:
+                    logger.info("   ⏹️ %s rejected; cancelling %d outstanding reviews", party_id, len(pending))
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                break
         
         # # Update status based on responses
         # if len(state.party_responses) == len(state.parties):
@@ -359,7 +549,7 @@ class ContractAmendmentOrchestrator:
     
     async def _conflict_resolution_node(self, state: AmendmentWorkflowState) -> AmendmentWorkflowState:
         """Conflict resolution node"""
-        print(f"⚡ CONFLICT RESOLUTION: Resolving {len(state.active_conflicts)} conflicts")
+        logger.info("⚡ CONFLICT RESOLUTION: Resolving %d conflicts", len(state.active_conflicts))
         
         # In a full implementation, this would use sophisticated AI mediation
         conflict_resolution_node = ConflictResolutionNode()
@@ -370,7 +560,7 @@ class ContractAmendmentOrchestrator:
         #         "remaining_conflicts": len(state.active_conflicts),
         #         "resolution_details": resolution_results
         #     }
-        print(result)
+        logger.debug("Conflict resolution result: %s", result)
         state.update_status(AmendmentStatus.CONSENSUS_BUILDING)
         
         return state
@@ -405,36 +595,39 @@ class ContractAmendmentOrchestrator:
 
     #     return state
     
-    async def _legal_review_node(self, state: AmendmentWorkflowState) -> AmendmentWorkflowState:
-        """Legal compliance review node"""
-        print("⚖️  LEGAL REVIEW: Checking compliance and legal requirements")
-        
-        # Use compliance checking tool
-        from .tools.contract_tools import CONTRACT_TOOLS
-        compliance_tool = CONTRACT_TOOLS["check_compliance"]
+    async def _legal_review_node(self, state: AmendmentWorkflowState) -> Dict[str, Any]:
+        """
+        Legal compliance review node. Runs alongside version control, so it returns
+        only the fields it owns; status is settled in final approval.
+        """
+        logger.info("⚖️  LEGAL REVIEW: Checking compliance and legal requirements")
         
-        # Perform compliance check
-        compliance_result = compliance_tool._run(
+        # Perform compliance check. All regulations go in one prompt, so a single
+        # async LLM call covers them while version control runs alongside.
+        compliance_result = await _COMPLIANCE_TOOL._arun(
             contract_content=state.original_contract or "",
             jurisdiction="US", # This would come from contract metadata
             contract_type="service_agreement", # This would be detected
             regulations=["GDPR", "SOX"] # This would be determined based on parties
         )
         
-        state.compliance_checks = compliance_result
-        
         if compliance_result.get("compliance_status") == "compliant":
-            state.legal_review_status = "approved"
-            state.update_status(AmendmentStatus.FINAL_APPROVAL)
+            legal_review_status = "approved"
         else:
-            state.legal_review_status = "requires_changes"
+            legal_review_status = "requires_changes"
             # Would typically route back to conflict resolution or party review
         
-        return state
+        return {
+            "compliance_checks": compliance_result,
+            "legal_review_status": legal_review_status
+        }
     
-    async def _version_control_node(self, state: AmendmentWorkflowState) -> AmendmentWorkflowState:
-        """Version control and document merging node"""
-        print("📝 VERSION CONTROL: Merging approved changes")
+    async def _version_control_node(self, state: AmendmentWorkflowState) -> Dict[str, Any]:
+        """
+        Version control and document merging node. Runs alongside legal review, so
+        it returns only the fields it owns; status is settled in final approval.
+        """
+        logger.info("📝 VERSION CONTROL: Merging approved changes")
         
         # Collect all approved changes
         approved_changes = []
@@ -447,37 +640,36 @@ class ContractAmendmentOrchestrator:
                     })
         
         if approved_changes:
-            # Use amendment merging tool
-            from .tools.contract_tools import CONTRACT_TOOLS
-            merge_tool = CONTRACT_TOOLS["merge_amendments"]
-            
-            merge_result = merge_tool._run(
+            # Use amendment merging tool (blocking LLM call, run in a worker thread)
+            merge_result = await asyncio.to_thread(
+                _MERGE_TOOL._run,
                 base_contract=state.original_contract or "",
                 approved_changes=approved_changes,
                 merge_strategy="balanced"
             )
             
             # Create new document version
-            from .graph_state import DocumentVersion
-            import hashlib
-            
             merged_content = merge_result.get("merged_contract", "")
             version = DocumentVersion(
                 content=merged_content,
-                content_hash=hashlib.md5(merged_content.encode()).hexdigest(),
+                content_hash=hashlib.blake2b(merged_content.encode(), digest_size=32).hexdigest(),
                 author="system_merge",
                 changes_summary=f"Merged {len(approved_changes)} approved amendments"
             )
             
             state.add_document_version(version)
-            state.final_document = merged_content
+            return {
+                "document_versions": state.document_versions,
+                "current_version": state.current_version,
+                "final_document": merged_content
+            }
         
-        state.update_status(AmendmentStatus.FINAL_APPROVAL)
-        return state
+        return {}
     
     async def _final_approval_node(self, state: AmendmentWorkflowState) -> AmendmentWorkflowState:
         """Final approval node"""
-        print("✅ FINAL APPROVAL: Completing amendment process")
+        logger.info("✅ FINAL APPROVAL: Completing amendment process")
+        state.update_status(AmendmentStatus.FINAL_APPROVAL)
         
         # Perform final validation
         if (state.is_consensus_reached() and 
@@ -495,7 +687,7 @@ class ContractAmendmentOrchestrator:
     
     async def _completion_node(self, state: AmendmentWorkflowState) -> AmendmentWorkflowState:
         """Workflow completion node"""
-        print(f"🎉 COMPLETION: Amendment workflow {state.workflow_id} completed successfully")
+        logger.info("🎉 COMPLETION: Amendment workflow %s completed successfully", state.workflow_id)
         
         state.update_status(AmendmentStatus.COMPLETED)
         state.completed_at = datetime.now(timezone.utc)
@@ -504,14 +696,14 @@ class ContractAmendmentOrchestrator:
     
     async def _error_handler_node(self, state: AmendmentWorkflowState) -> AmendmentWorkflowState:
         """Error handling node"""
-        print(f"❌ ERROR HANDLER: Processing errors for workflow {state.workflow_id}")
+        logger.error("❌ ERROR HANDLER: Processing errors for workflow %s", state.workflow_id)
         
         state.update_status(AmendmentStatus.FAILED)
         
         # Log error details
         error_summary = {
-            "error_count": len(state.errors),
-            "latest_errors": state.errors[-3:] if state.errors else [],
+            "error_count": state.error_count,
+            "latest_errors": state.errors[-3:],
             "failed_at": datetime.now(timezone.utc).isoformat()
         }
         
@@ -14,14 +14,20 @@ from langchain.schema import HumanMessage, SystemMessage
 import re
 import os
 import hashlib
-import json
+import orjson
 from dotenv import load_dotenv
 
+from ..llm import get_llm
+
 load_dotenv()
 
 
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
+# Both tools ask for a JSON object; JSON mode stops the model wrapping it in
+# markdown fences, which would otherwise send every response down the fallback path
+_JSON_MODE = {"response_format": {"type": "json_object"}}
+
 
 class AmendmentMergeInput(BaseModel):
     """Input schema for amendment merging tool"""
@@ -40,7 +46,7 @@ class AmendmentMergeTool(BaseTool):
     
     def __init__(self, **data):
         super().__init__(**data)
-        self._llm = ChatOpenAI(model="gpt-4-turbo-preview", temperature=0.1)
+        self._llm = get_llm(model="gpt-4-turbo-preview", temperature=0.1, model_kwargs=_JSON_MODE)
     
     def _run(self, base_contract: str, approved_changes: List[Dict[str, Any]], 
            merge_strategy: str = "balanced") -> Dict[str, Any]:
@@ -53,7 +59,7 @@ class AmendmentMergeTool(BaseTool):
         {base_contract}
         
         Approved Changes:
-        {json.dumps(approved_changes, indent=2)}
+        {orjson.dumps(approved_changes, option=orjson.OPT_INDENT_2).decode()}
         
         Merge Strategy Guidelines:
         - Conservative: Minimal changes, preserve original structure
@@ -86,8 +92,8 @@ class AmendmentMergeTool(BaseTool):
         response = self._llm.invoke(messages)
         
         try:
-            result = json.loads(response.content)
-        except json.JSONDecodeError:
+            result = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
             result = {
                 "merged_contract": response.content,
                 "changes_applied": [],
@@ -115,12 +121,23 @@ class ComplianceCheckTool(BaseTool):
     
     def __init__(self, **data):
         super().__init__(**data)
-        self._llm = ChatOpenAI(model="gpt-4-turbo-preview", temperature=0.1)
+        self._llm = get_llm(model="gpt-4-turbo-preview", temperature=0.1, model_kwargs=_JSON_MODE)
     
     def _run(self, contract_content: str, jurisdiction: str, contract_type: str,
            regulations: Optional[List[str]] = None) -> Dict[str, Any]:
         """Check contract for compliance issues"""
-        
+        messages = self._compliance_messages(contract_content, jurisdiction, contract_type, regulations)
+        return self._parse_compliance(self._llm.invoke(messages))
+    
+    async def _arun(self, contract_content: str, jurisdiction: str, contract_type: str,
+                    regulations: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Check contract for compliance issues without tying up a worker thread"""
+        messages = self._compliance_messages(contract_content, jurisdiction, contract_type, regulations)
+        return self._parse_compliance(await self._llm.ainvoke(messages))
+    
+    @staticmethod
+    def _compliance_messages(contract_content: str, jurisdiction: str, contract_type: str,
+                             regulations: Optional[List[str]] = None) -> List[Any]:
         reg_focus = ""
         if regulations:
             reg_focus = f"\nPay special attention to: {', '.join(regulations)}"
@@ -150,16 +167,16 @@ class ComplianceCheckTool(BaseTool):
         }}
         """
         
-        messages = [
+        return [
             SystemMessage(content="You are a compliance expert specializing in contract law."),
             HumanMessage(content=compliance_prompt)
         ]
-        
-        response = self._llm.invoke(messages)
-        
+    
+    @staticmethod
+    def _parse_compliance(response: Any) -> Dict[str, Any]:
         try:
-            result = json.loads(response.content)
-        except json.JSONDecodeError:
+            result = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
             result = {
                 "compliance_status": "requires_review",
                 "raw_response": response.content
@@ -8,11 +8,12 @@ contract amendment orchestration system powered by LangGraph.
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.websockets import WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, Field
 from typing import Dict, List, Any, Optional
 import asyncio
-import json
+import orjson
 from datetime import datetime, timezone
 
 from backend.app.core.orchestrator import (
@@ -21,6 +22,7 @@ from backend.app.core.orchestrator import (
     get_amendment_status
 )
 # Removed unused import AmendmentStatus
+from backend.app.core.llm import close_llm_clients
 from backend.app.services.notification_service import NotificationService
 from backend.app.db.models import Contract, Amendment, ContractVersion
 from backend.app.db.databases import get_db, init_database, drop_tables
@@ -29,13 +31,50 @@ from uuid import uuid4
 
 from scalar_fastapi import get_scalar_api_reference
 import os
+import queue
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-def lifespan_handler(app: FastAPI):
+
+def _start_log_listener() -> Optional[QueueListener]:
+    """
+    Send backend.app log records through a queue so handler I/O runs on a listener
+    thread. Skipped when the host (e.g. a logging config or test harness) already
+    put handlers on the root logger; records then propagate to those as usual.
+    """
+    app_logger = logging.getLogger("backend.app")
+    app_logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+    if logging.getLogger().handlers:
+        return None
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    app_logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def _stop_log_listener(listener: Optional[QueueListener]) -> None:
+    """Detach the queue handler and flush the listener, so a restart starts clean"""
+    if listener is None:
+        return
+    app_logger = logging.getLogger("backend.app")
+    for handler in list(app_logger.handlers):
+        if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+            app_logger.removeHandler(handler)
+    listener.stop()
+
+
+async def lifespan_handler(app: FastAPI):
+    log_listener = _start_log_listener()
     init_database()
     os.environ["LANGSMITH_TRACING"] = os.getenv("LANGSMITH_TRACING", "true")
     os.environ["LANGSMITH_API_KEY"] = os.getenv("LANGSMITH_API_KEY", "")
@@ -43,7 +82,9 @@ def lifespan_handler(app: FastAPI):
     os.environ["LANGSMITH_PROJECT_NAME"] = os.getenv("LANGSMITH_PROJECT_NAME", "")
 
     yield
+    await close_llm_clients()
     drop_tables()
+    _stop_log_listener(log_listener)
 
 
 # Initialize FastAPI app
@@ -127,6 +168,11 @@ class PartyResponseUpdate(BaseModel):
     conditions: Optional[List[str]] = None
 
 
+def _dumps(message: Dict[str, Any]) -> str:
+    """Encode a WebSocket message; orjson handles datetimes and enums natively"""
+    return orjson.dumps(message, default=str).decode()
+
+
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
@@ -146,10 +192,10 @@ class ConnectionManager:
         if workflow_id in self.active_connections:
             for connection in self.active_connections[workflow_id]:
                 try:
-                    await connection.send_text(json.dumps(message))
+                    await connection.send_text(_dumps(message))
                 except (RuntimeError, WebSocketDisconnect) as e:
                     # Remove broken connections
-                    logging.warning(f"WebSocket connection error: {e}")
+                    logger.warning("WebSocket connection error: %s", e)
                     self.active_connections[workflow_id].remove(connection)
 
 
@@ -191,6 +237,23 @@ async def scalar_html():
         scalar_proxy_url="https://proxy.scalar.com",
     )
 
+
+def _record_amendment(request: AmendmentRequest, db: Session) -> str:
+    """Save a new amendment as "initiated" and return its workflow ID"""
+    workflow_id = str(uuid4())
+    amendment = Amendment(
+        id=workflow_id,
+        contract_id=request.contract_id,
+        proposed_changes=request.proposed_changes,
+        parties_involved=[party.id for party in request.parties],
+        status="initiated",
+        created_at=datetime.now(timezone.utc)
+    )
+    db.add(amendment)
+    db.commit()
+    return workflow_id
+
+
 @app.post("/api/v1/amendments/initiate", response_model=AmendmentResponse)
 async def initiate_amendment(
     request: AmendmentRequest,
@@ -201,24 +264,13 @@ async def initiate_amendment(
     Initiate a new multi-party contract amendment workflow
     """
     try:
-        print(f"🚀 API: Initiating amendment for contract {request.contract_id}")
+        logger.info("🚀 API: Initiating amendment for contract %s", request.contract_id)
         
         # Convert PartyConfig objects to dictionaries
         parties_dict = [party.model_dump() for party in request.parties]
         
-        workflow_id = str(uuid4())  # generate ID first
-
         # Save "initiated" right away
-        amendment = Amendment(
-            id=workflow_id,
-            contract_id=request.contract_id,
-            proposed_changes=request.proposed_changes,
-            parties_involved=[party.id for party in request.parties],
-            status="initiated",
-            created_at=datetime.now(timezone.utc)
-        )
-        db.add(amendment)
-        db.commit()
+        workflow_id = _record_amendment(request, db)
 
         # Kick off initiation in background
         background_tasks.add_task(
@@ -244,10 +296,39 @@ async def initiate_amendment(
         )
         
     except Exception as e:
-        print(f"❌ API Error: {str(e)}")
+        logger.exception("❌ API Error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to initiate amendment: {str(e)}")
 
 
+@app.post("/api/v1/amendments/stream")
+async def stream_amendment(
+    request: AmendmentRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Run a multi-party contract amendment workflow, streaming its progress as
+    newline-delimited JSON: LLM tokens as they are generated and each node's
+    state update as it finishes
+    """
+    workflow_id = _record_amendment(request, db)
+
+    async def events():
+        try:
+            async for event in orchestrator.stream_amendment(
+                workflow_id=workflow_id,
+                contract_id=request.contract_id,
+                parties=[party.model_dump() for party in request.parties],
+                proposed_changes=request.proposed_changes,
+                original_contract=request.original_contract,
+                workflow_config=request.workflow_config
+            ):
+                yield _dumps(event) + "\n"
+        except Exception as e:
+            yield _dumps({"workflow_id": workflow_id, "type": "error", "message": str(e)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @app.get("/api/v1/amendments/{workflow_id}/status", response_model=WorkflowStatusResponse)
 async def get_workflow_status(workflow_id: str):
     """
@@ -264,8 +345,8 @@ async def get_workflow_status(workflow_id: str):
             status=status["status"],
             parties_status=status["parties_status"],
             conflicts=status["conflicts"],
-            created_at=datetime.fromisoformat(status["created_at"]),
-            updated_at=datetime.fromisoformat(status["updated_at"]),
+            created_at=status["created_at"],
+            updated_at=status["updated_at"],
             # estimated_completion=datetime.fromisoformat(status["estimated_completion"]) if status.get("estimated_completion") else None
         )
         
@@ -466,12 +547,12 @@ async def websocket_endpoint(websocket: WebSocket, workflow_id: str):
     # Send initial status
     try:
         status = await get_amendment_status(workflow_id)
-        await websocket.send_text(json.dumps({
+        await websocket.send_text(_dumps({
             "type": "status_update",
             "data": status
         }))
     except Exception as e:
-        await websocket.send_text(json.dumps({
+        await websocket.send_text(_dumps({
             "type": "error",
             "message": f"Failed to get initial status: {str(e)}"
         }))
@@ -482,23 +563,26 @@ async def websocket_endpoint(websocket: WebSocket, workflow_id: str):
             data = await websocket.receive_text()
             
             # Echo back for now (could implement client commands)
-            await websocket.send_text(json.dumps({
+            await websocket.send_text(_dumps({
                 "type": "echo",
                 "data": data,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow()
             }))
             
     except WebSocketDisconnect:
         manager.disconnect(websocket, workflow_id)
-        print(f"WebSocket disconnected for workflow {workflow_id}")
+        logger.info("WebSocket disconnected for workflow %s", workflow_id)
 
 
 # Background tasks
+_FINISHED_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+
 async def monitor_workflow(workflow_id: str):
     """
     Background task to monitor workflow progress and send updates
     """
-    print(f"🔍 Starting workflow monitor for {workflow_id}")
+    logger.info("🔍 Starting workflow monitor for %s", workflow_id)
     
     max_iterations = 100  # Prevent infinite loops
     iteration = 0
@@ -511,12 +595,12 @@ async def monitor_workflow(workflow_id: str):
             await manager.broadcast_to_workflow(workflow_id, {
                 "type": "status_update",
                 "data": status,
-                "timestamp": datetime.now(datetime.timezone.utc).isoformat()
+                "timestamp": datetime.now(timezone.utc)
             })
             
             # Check if workflow is complete
-            if status.get("status") in ["completed", "failed", "cancelled"]:
-                print(f"✅ Workflow {workflow_id} finished with status: {status.get('status')}")
+            if status.get("status") in _FINISHED_STATUSES:
+                logger.info("✅ Workflow %s finished with status: %s", workflow_id, status.get("status"))
                 break
             
             # Wait before next check
@@ -524,7 +608,7 @@ async def monitor_workflow(workflow_id: str):
             iteration += 1
             
         except Exception as e:
-            print(f"❌ Monitor error for {workflow_id}: {str(e)}")
+            logger.warning("❌ Monitor error for %s: %s", workflow_id, e)
             await asyncio.sleep(60)  # Wait longer on error
             
-    print(f"🏁 Workflow monitor for {workflow_id} finished")
+    logger.info("🏁 Workflow monitor for %s finished", workflow_id)
@@ -9,6 +9,7 @@ for the contract amendment orchestration system.
 from typing import Dict, List, Any, Optional
 import asyncio
 import json
+import logging
 from datetime import datetime
 from enum import Enum
 import smtplib
@@ -17,6 +18,8 @@ from email.mime.multipart import MIMEMultipart
 
 from ..core.graph_state import AmendmentWorkflowState, AmendmentStatus
 
+logger = logging.getLogger(__name__)
+
 
 class NotificationType(str, Enum):
     """Types of notifications"""
@@ -92,7 +95,7 @@ class NotificationService:
         }
         
         self.active_subscriptions[workflow_id].append(subscription)
-        print(f"📧 User {subscription['user_id']} subscribed to workflow {workflow_id}")
+        logger.info("📧 User %s subscribed to workflow %s", subscription["user_id"], workflow_id)
     
     async def notify_workflow_event(self, workflow_id: str, event_type: NotificationType, 
                                   state: AmendmentWorkflowState, additional_data: Optional[Dict] = None):
@@ -101,7 +104,7 @@ class NotificationService:
         """
         
         if workflow_id not in self.active_subscriptions:
-            print(f"⚠️  No subscribers for workflow {workflow_id}")
+            logger.info("⚠️  No subscribers for workflow %s", workflow_id)
             return
         
         # Prepare notification content
@@ -111,6 +114,7 @@ class NotificationService:
         
         # Send to all subscribers
         subscribers = self.active_subscriptions[workflow_id]
+        enabled_channels = {c.value for c in self.enabled_channels}
         
         for subscriber in subscribers:
             # Check if subscriber wants this type of notification
@@ -119,7 +123,7 @@ class NotificationService:
             
             # Send via each subscribed channel
             for channel in subscriber["channels"]:
-                if channel in [c.value for c in self.enabled_channels]:
+                if channel in enabled_channels:
                     await self._send_notification(
                         channel=channel,
                         recipient=subscriber,
@@ -184,7 +188,7 @@ class NotificationService:
             self.websocket_connections[workflow_id] = []
         
         self.websocket_connections[workflow_id].append(websocket)
-        print(f"🔌 WebSocket connected for workflow {workflow_id}")
+        logger.info("🔌 WebSocket connected for workflow %s", workflow_id)
     
     async def remove_websocket_connection(self, workflow_id: str, websocket):
         """Remove WebSocket connection"""
@@ -192,7 +196,7 @@ class NotificationService:
         if workflow_id in self.websocket_connections:
             try:
                 self.websocket_connections[workflow_id].remove(websocket)
-                print(f"🔌 WebSocket disconnected for workflow {workflow_id}")
+                logger.info("🔌 WebSocket disconnected for workflow %s", workflow_id)
             except ValueError:
                 pass  # Connection not in list
     
@@ -215,7 +219,7 @@ class NotificationService:
             try:
                 await websocket.send_text(message)
             except Exception as e:
-                print(f"Failed to send WebSocket message: {e}")
+                logger.warning("Failed to send WebSocket message: %s", e)
                 # Remove broken connection
                 await self.remove_websocket_connection(workflow_id, websocket)
     
@@ -338,10 +342,10 @@ class NotificationService:
             elif channel == NotificationChannel.WEBHOOK.value:
                 await self._send_webhook_notification(recipient, content, workflow_id)
             
-            print(f"✅ Sent {channel} notification to {recipient.get('user_id')}")
+            logger.info("✅ Sent %s notification to %s", channel, recipient.get("user_id"))
             
         except Exception as e:
-            print(f"❌ Failed to send {channel} notification: {str(e)}")
+            logger.warning("❌ Failed to send %s notification: %s", channel, e)
     
     async def _send_email_notification(self, recipient: Dict, content: Dict):
         """Send email notification"""
@@ -360,12 +364,12 @@ class NotificationService:
             
             # Send email (in production, use proper email service)
             # For demo, just log the email content
-            print(f"📧 EMAIL TO: {recipient['email']}")
-            print(f"📧 SUBJECT: {content['subject']}")
-            print(f"📧 BODY: {content['body'][:100]}...")
+            logger.info("📧 EMAIL TO: %s", recipient["email"])
+            logger.info("📧 SUBJECT: %s", content["subject"])
+            logger.debug("📧 BODY: %.100s...", content["body"])
             
         except Exception as e:
-            print(f"Email send error: {str(e)}")
+            logger.warning("Email send error: %s", e)
     
     async def _send_websocket_notification(self, workflow_id: str, content: Dict, recipient: Dict):
         """Send WebSocket notification"""
@@ -395,8 +399,8 @@ class NotificationService:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        print(f"🔗 WEBHOOK TO: {webhook_url}")
-        print(f"🔗 PAYLOAD: {json.dumps(payload, indent=2)}")
+        logger.info("🔗 WEBHOOK TO: %s", webhook_url)
+        logger.debug("🔗 PAYLOAD: %s", payload)
     
     def get_notification_history(self, workflow_id: Optional[str] = None) -> List[Dict]:
         """Get notification history"""
@@ -0,0 +1,5 @@
+import os
+
+# Node modules build their chat model clients at import; no request is sent in
+# these tests, but the OpenAI client refuses to construct without a key
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
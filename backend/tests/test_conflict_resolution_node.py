@@ -0,0 +1,106 @@
+# backend/tests/test_conflict_resolution_node.py
+import asyncio
+import unittest
+from unittest import mock
+
+from backend.app.core.graph_state import AmendmentWorkflowState, ConflictInfo
+from backend.app.core.nodes import conflict_resolution_node
+from backend.app.core.nodes.conflict_resolution_node import ConflictResolutionNode
+
+
+def _conflict(**overrides):
+    fields = dict(
+        conflict_type="contradictory_terms",
+        description="Party party-a rejected: payment terms too long",
+        affected_parties=["party-a"],
+        affected_clauses=["payment_terms"],
+        severity="high",
+    )
+    fields.update(overrides)
+    return ConflictInfo(**fields)
+
+
+class ResolutionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        conflict_resolution_node._RESOLUTION_CACHE.clear()
+        self.addCleanup(conflict_resolution_node._RESOLUTION_CACHE.clear)
+        self.node = ConflictResolutionNode()
+        self.state = AmendmentWorkflowState(
+            contract_id="contract-1",
+            parties=["party-a", "party-b"],
+            proposed_changes={"payment_terms": "Net 45"},
+        )
+
+    def _resolve(self, conflict, is_valid):
+        resolution = {"conflict_id": conflict.conflict_id, "proposed_solution": "Net 40", "confidence_score": 0.5}
+        complete = mock.AsyncMock(return_value={"resolutions": [resolution]})
+        validate = mock.AsyncMock(return_value={"is_valid": is_valid, "issues": [] if is_valid else ["unfair"]})
+        with mock.patch.object(self.node, "_complete_json", complete), \
+                mock.patch.object(self.node, "_validate_resolution", validate):
+            outcomes = asyncio.run(self.node._resolve_conflicts_batch(self.state, [conflict], {}, {}))
+        return outcomes[0], complete.await_count
+
+    def test_rejected_resolution_is_not_reused(self):
+        outcome, calls = self._resolve(_conflict(), is_valid=False)
+        self.assertEqual(outcome["status"], "resolution_failed")
+        self.assertEqual(calls, 1)
+        self.assertEqual(len(conflict_resolution_node._RESOLUTION_CACHE), 0)
+
+        _, calls = self._resolve(_conflict(), is_valid=False)
+        self.assertEqual(calls, 1)
+
+    def test_validated_resolution_is_reused_for_the_same_conflict(self):
+        self._resolve(_conflict(), is_valid=True)
+        self.assertEqual(len(conflict_resolution_node._RESOLUTION_CACHE), 1)
+
+        repeat = _conflict()
+        outcome, calls = self._resolve(repeat, is_valid=True)
+        self.assertEqual(calls, 0)
+        self.assertEqual(outcome["resolution_data"]["conflict_id"], repeat.conflict_id)
+
+
+class ConflictAnalysisTest(unittest.TestCase):
+
+    def test_unparseable_analysis_falls_back_to_empty(self):
+        node = ConflictResolutionNode()
+        state = AmendmentWorkflowState(contract_id="contract-1", parties=["party-a"])
+        complete = mock.AsyncMock(side_effect=ValueError("Expected a JSON object"))
+        with mock.patch.object(node, "_complete_json", complete):
+            self.assertEqual(asyncio.run(node._analyze_conflicts(state)), {})
+
+
+class StrategySelectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.node = ConflictResolutionNode()
+
+    def _strategy(self, complexity="moderate", **overrides):
+        return self.node._select_resolution_strategy(_conflict(**overrides), complexity)
+
+    def test_high_severity_complex_conflict_uses_precedent(self):
+        self.assertEqual(self._strategy("complex", severity="high"), "precedent_based")
+
+    def test_precedent_rule_outranks_conflict_type(self):
+        self.assertEqual(
+            self._strategy("complex", severity="high", conflict_type="policy_violation"), "precedent_based"
+        )
+
+    def test_contradictory_terms_use_compromise(self):
+        self.assertEqual(self._strategy("complex", severity="medium"), "compromise_based")
+
+    def test_policy_violation_uses_alternative_approach(self):
+        self.assertEqual(self._strategy(conflict_type="policy_violation"), "alternative_approach")
+
+    def test_many_parties_use_win_win(self):
+        parties = ["party-a", "party-b", "party-c"]
+        self.assertEqual(
+            self._strategy(conflict_type="overlapping_sections", affected_parties=parties), "win_win_optimization"
+        )
+
+    def test_unmatched_conflict_uses_default(self):
+        self.assertEqual(self._strategy(conflict_type="overlapping_sections"), "value_maximization")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+# backend/tests/test_contract_text.py
+import unittest
+from unittest import mock
+
+from backend.app.core import contract_text
+
+
+class TruncateTokensTest(unittest.TestCase):
+
+    def tearDown(self):
+        contract_text.tokenizer.cache_clear()
+
+    def test_falls_back_to_characters_without_encoding(self):
+        contract_text.tokenizer.cache_clear()
+        with mock.patch.object(contract_text.tiktoken, "get_encoding", side_effect=OSError("offline")):
+            self.assertIsNone(contract_text.tokenizer())
+            text = "x" * 100
+            self.assertEqual(
+                contract_text.truncate_tokens(text, 10),
+                text[:10 * contract_text.CHARS_PER_TOKEN],
+            )
+            self.assertEqual(contract_text.truncate_tokens("short", 10), "short")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,232 @@
+# backend/tests/test_graph_state.py
+import unittest
+
+from backend.app.core.graph_state import AmendmentWorkflowState, ConflictInfo, PartyResponse
+
+
+CONTRACT = "\n\n".join([
+    "1. Payment Terms. Invoices are payable within 30 days.",
+    "2. Termination. Either party may terminate with 60 days notice.",
+    "3. Liability. Liability is capped at fees paid.",
+])
+
+
+class RelevantContractExcerptTest(unittest.TestCase):
+
+    def setUp(self):
+        self.state = AmendmentWorkflowState(
+            contract_id="contract-1",
+            parties=["party-a", "party-b"],
+            original_contract=CONTRACT,
+            proposed_changes={"payment_terms": "Net 45"},
+        )
+
+    def test_excerpt_follows_updated_changes(self):
+        before = self.state.relevant_contract_excerpt(1000)
+        self.assertIn("Payment Terms", before)
+
+        self.state.update_proposed_changes({"termination": "90 days notice"})
+        after = self.state.relevant_contract_excerpt(1000)
+
+        self.assertIn("Termination", after)
+        self.assertNotIn("Payment Terms", after)
+        self.assertIn("termination", self.state.proposed_changes_json())
+
+    def test_excerpt_follows_reassigned_changes(self):
+        self.state.relevant_contract_excerpt(1000)
+
+        self.state.proposed_changes = {"liability": "Uncapped"}
+
+        self.assertIn("Liability", self.state.relevant_contract_excerpt(1000))
+        self.assertNotIn("Payment Terms", self.state.relevant_contract_excerpt(1000))
+
+    def test_excerpt_follows_reassigned_contract(self):
+        self.state.relevant_contract_excerpt(1000)
+
+        self.state.original_contract = "Payment Terms. Invoices are payable on receipt."
+
+        self.assertIn("on receipt", self.state.relevant_contract_excerpt(1000))
+
+
+
+def _response(party_id, status):
+    return PartyResponse(party_id=party_id, organization=party_id.upper(), status=status)
+
+
+class PendingPartiesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.state = AmendmentWorkflowState(contract_id="contract-1", parties=["party-a", "party-b"])
+
+    def test_pending_response_from_non_party_is_ignored(self):
+        self.state.add_party_response("party-a", _response("party-a", "approved"))
+        self.state.add_party_response("party-b", _response("party-b", "approved"))
+
+        self.state.add_party_response("outsider", _response("outsider", "pending"))
+
+        self.assertFalse(self.state.has_pending_parties())
+        self.assertEqual(self.state.get_pending_parties(), [])
+
+    def test_pending_set_follows_reassigned_parties(self):
+        self.state.add_party_response("party-a", _response("party-a", "approved"))
+        self.assertEqual(self.state.get_pending_parties(), ["party-b"])
+
+        self.state.parties = ["party-a"]
+
+        self.assertFalse(self.state.has_pending_parties())
+        self.assertEqual(self.state.get_pending_parties(), [])
+
+        self.state.parties = ["party-a", "party-c"]
+
+        self.assertTrue(self.state.has_pending_parties())
+        self.assertEqual(self.state.get_pending_parties(), ["party-c"])
+
+
+
+class UpdatePartyStatusTest(unittest.TestCase):
+
+    def setUp(self):
+        self.state = AmendmentWorkflowState(contract_id="contract-1", parties=["party-a", "party-b"])
+        self.state.add_party_response("party-a", _response("party-a", "requested_changes"))
+
+    def test_approval_is_recorded(self):
+        self.assertTrue(self.state.update_party_status("party-a", "approved"))
+
+        self.assertEqual(self.state.received_approvals, ["party-a"])
+        self.assertEqual(self.state.approved_count, 1)
+
+    def test_withdrawn_approval_is_removed(self):
+        self.state.update_party_status("party-a", "approved")
+
+        self.state.update_party_status("party-a", "rejected")
+
+        self.assertEqual(self.state.received_approvals, [])
+        self.assertEqual(self.state.approved_count, 0)
+        self.assertEqual(self.state.rejected_count, 1)
+
+
+class StatusCountsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.state = AmendmentWorkflowState(contract_id="contract-1", parties=["party-a", "party-b", "party-c"])
+
+    def test_counts_follow_added_responses(self):
+        self.state.add_party_response("party-a", _response("party-a", "approved"))
+        self.state.add_party_response("party-b", _response("party-b", "rejected"))
+        self.state.add_party_response("party-c", _response("party-c", "approved"))
+
+        self.assertEqual(self.state.approved_count, 2)
+        self.assertEqual(self.state.rejected_count, 1)
+
+    def test_replaced_response_moves_its_count(self):
+        self.state.add_party_response("party-a", _response("party-a", "rejected"))
+
+        self.state.add_party_response("party-a", _response("party-a", "approved"))
+
+        self.assertEqual(self.state.approved_count, 1)
+        self.assertEqual(self.state.rejected_count, 0)
+
+    def test_counts_are_rebuilt_from_loaded_responses(self):
+        self.state.add_party_response("party-a", _response("party-a", "approved"))
+        self.state.add_party_response("party-b", _response("party-b", "rejected"))
+
+        loaded = AmendmentWorkflowState(**self.state.model_dump())
+
+        self.assertEqual(loaded.approved_count, 1)
+        self.assertEqual(loaded.rejected_count, 1)
+        self.assertEqual(loaded.get_pending_parties(), ["party-c"])
+
+
+class PendingPartiesIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.state = AmendmentWorkflowState(contract_id="contract-1", parties=["party-a", "party-b"])
+
+    def test_parties_without_responses_start_pending(self):
+        self.assertEqual(set(self.state.get_pending_parties()), {"party-a", "party-b"})
+
+    def test_decision_removes_party_from_pending(self):
+        self.state.add_party_response("party-a", _response("party-a", "requested_changes"))
+
+        self.assertEqual(self.state.get_pending_parties(), ["party-b"])
+
+    def test_status_update_back_to_pending_restores_party(self):
+        self.state.add_party_response("party-a", _response("party-a", "approved"))
+
+        self.state.update_party_status("party-a", "pending")
+
+        self.assertEqual(set(self.state.get_pending_parties()), {"party-a", "party-b"})
+
+    def test_update_for_unknown_response_changes_nothing(self):
+        self.assertFalse(self.state.update_party_status("party-a", "approved"))
+
+        self.assertEqual(set(self.state.get_pending_parties()), {"party-a", "party-b"})
+        self.assertEqual(self.state.approved_count, 0)
+
+
+def _conflict(affected_parties):
+    return ConflictInfo(
+        conflict_type="contradictory_terms",
+        description="Payment terms disagree",
+        affected_parties=affected_parties,
+        affected_clauses=["payment_terms"],
+        severity="medium",
+    )
+
+
+class ConflictIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.state = AmendmentWorkflowState(contract_id="contract-1", parties=["party-a", "party-b", "party-c"])
+
+    def test_added_conflict_is_indexed_by_id(self):
+        conflict = _conflict(["party-a"])
+
+        self.state.add_conflict(conflict)
+
+        self.assertIs(self.state.get_conflict(conflict.conflict_id), conflict)
+        self.assertIsNone(self.state.get_conflict("missing"))
+        self.assertEqual(self.state.active_conflicts, [conflict.conflict_id])
+
+    def test_party_conflicts_cover_every_affected_party(self):
+        self.state.add_conflict(_conflict(["party-a", "party-b"]))
+
+        self.assertTrue(self.state.has_party_conflict("party-a"))
+        self.assertTrue(self.state.has_party_conflict("party-b"))
+        self.assertFalse(self.state.has_party_conflict("party-c"))
+
+    def test_party_keeps_its_first_conflict(self):
+        first = _conflict(["party-a"])
+        self.state.add_conflict(first)
+
+        second = _conflict(["party-a", "party-c"])
+        self.state.add_conflict(second)
+
+        self.assertEqual(
+            self.state._party_conflicts,
+            {"party-a": first.conflict_id, "party-c": second.conflict_id},
+        )
+
+    def test_resolving_moves_conflict_out_of_active(self):
+        conflict = _conflict(["party-a"])
+        self.state.add_conflict(conflict)
+
+        self.assertTrue(self.state.resolve_conflict(conflict.conflict_id, "agreed"))
+        self.assertFalse(self.state.resolve_conflict("missing"))
+
+        self.assertEqual(self.state.active_conflicts, [])
+        self.assertEqual(self.state.resolved_conflicts, [conflict.conflict_id])
+        self.assertEqual(conflict.resolution_status, "resolved")
+
+    def test_indexes_are_rebuilt_from_loaded_conflicts(self):
+        conflict = _conflict(["party-b"])
+        self.state.add_conflict(conflict)
+
+        loaded = AmendmentWorkflowState(**self.state.model_dump())
+
+        self.assertEqual(loaded.get_conflict(conflict.conflict_id).description, conflict.description)
+        self.assertTrue(loaded.has_party_conflict("party-b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+# backend/tests/test_llm.py
+import asyncio
+import unittest
+
+import httpx
+
+from backend.app.core.llm import LoopPooledAsyncClient
+
+
+class LoopPooledAsyncClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.paths = []
+        self.client = LoopPooledAsyncClient(
+            transport=httpx.MockTransport(self._handle), base_url="https://api.example.com"
+        )
+
+    def _handle(self, request):
+        self.paths.append(request.url.path)
+        return httpx.Response(200, json={"ok": True})
+
+    def _get(self, path):
+        return self.client.send(self.client.build_request("GET", path))
+
+    def test_outer_client_has_no_pool_of_its_own(self):
+        self.assertNotIsInstance(self.client._transport, httpx.AsyncHTTPTransport)
+        self.assertEqual(self.client._mounts, {})
+
+    def test_requests_survive_close_and_a_new_event_loop(self):
+        async def use():
+            first = await self._get("/first")
+            await self.client.aclose()
+            second = await self._get("/second")
+            await self.client.aclose()
+            return first.status_code, second.status_code
+
+        self.assertEqual(asyncio.run(use()), (200, 200))
+        self.assertEqual(asyncio.run(use()), (200, 200))
+        self.assertEqual(self.paths, ["/first", "/second", "/first", "/second"])
+        self.assertFalse(self.client.is_closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
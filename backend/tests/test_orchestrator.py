@@ -0,0 +1,179 @@
+# backend/tests/test_orchestrator.py
+import asyncio
+import json
+import unittest
+from typing import Any, List, Optional
+from unittest import mock
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from backend.app.core.graph_state import AmendmentWorkflowState
+from backend.app.core.orchestrator import (
+    BoundedMemorySaver,
+    ContractAmendmentOrchestrator,
+    ContractContextAnalysis,
+)
+
+
+ANALYSIS = {
+    "contract_type": "service_agreement",
+    "complexity_indicators": [],
+    "complexity_score": 3,
+    "amendment_areas": ["payment_terms"],
+    "potential_risks": [],
+    "stakeholder_impact": {"party-a": "minor"},
+    "recommended_review_time": "1 day",
+}
+
+
+class _ToolCallStreamModel(BaseChatModel):
+    """Chat model answering with one tool call whose arguments stream in fragments"""
+    fragments: List[str]
+
+    @property
+    def _llm_type(self) -> str:
+        return "tool-call-stream"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        tool_call = {"name": "ContractContextAnalysis", "args": json.loads("".join(self.fragments)), "id": "call-1"}
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="", tool_calls=[tool_call]))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        for index, fragment in enumerate(self.fragments):
+            first = index == 0
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[{
+                "name": "ContractContextAnalysis" if first else None,
+                "args": fragment,
+                "id": "call-1" if first else None,
+                "index": 0,
+            }]))
+            if run_manager:
+                await run_manager.on_llm_new_token("", chunk=chunk)
+            yield chunk
+
+
+async def _passthrough(self, state):
+    return state
+
+
+async def _no_legal_review(self, state):
+    return {"legal_review_status": "approved"}
+
+
+class StreamAmendmentTest(unittest.TestCase):
+
+    def _events(self, orchestrator: ContractAmendmentOrchestrator, original_contract: Optional[str]):
+        async def consume():
+            return [event async for event in orchestrator.stream_amendment(
+                "workflow-1", "contract-1", [{"id": "party-a", "organization": "A"}],
+                {"payment_terms": "Net 45"}, original_contract
+            )]
+        return asyncio.run(consume())
+
+    @mock.patch.object(ContractAmendmentOrchestrator, "_legal_review_node", _no_legal_review)
+    @mock.patch.object(ContractAmendmentOrchestrator, "_party_review_node", _passthrough)
+    def test_streams_context_analysis_arguments_and_json_node_updates(self):
+        orchestrator = ContractAmendmentOrchestrator()
+        encoded = json.dumps(ANALYSIS)
+        fragments = [encoded[:20], encoded[20:60], encoded[60:]]
+        orchestrator.context_analyzer = _ToolCallStreamModel(fragments=fragments).with_structured_output(
+            ContractContextAnalysis, method="function_calling"
+        )
+
+        events = self._events(orchestrator, "1. Payment Terms. Net 30.")
+
+        arguments = [event for event in events if event["type"] == "arguments"]
+        self.assertEqual([event["content"] for event in arguments], fragments)
+        self.assertTrue(all(event["node"] == "initiator" for event in arguments))
+
+        updates = [event for event in events if event["type"] == "node"]
+        self.assertEqual(updates[0]["node"], "initiator")
+        self.assertEqual(
+            updates[0]["output"]["node_outputs"]["contract_analysis"]["complexity_score"], 3
+        )
+        json.dumps(events)
+
+
+def _thread_config(thread_id):
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+class BoundedMemorySaverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.saver = BoundedMemorySaver(maxsize=2)
+
+    def _put(self, *thread_ids):
+        for thread_id in thread_ids:
+            self.saver.put(_thread_config(thread_id), empty_checkpoint(), {}, {})
+
+    def test_oldest_thread_is_evicted_over_the_limit(self):
+        self._put("a", "b", "c")
+
+        self.assertEqual(set(self.saver.storage), {"b", "c"})
+        self.assertIsNone(self.saver.get_tuple(_thread_config("a")))
+
+    def test_new_checkpoint_refreshes_a_thread(self):
+        self._put("a", "b", "a", "c")
+
+        self.assertEqual(set(self.saver.storage), {"a", "c"})
+        self.assertEqual(list(self.saver._thread_order), ["a", "c"])
+
+    def test_deleted_thread_frees_its_slot(self):
+        self._put("a", "b")
+
+        self.saver.delete_thread("a")
+        self._put("c")
+
+        self.assertEqual(set(self.saver.storage), {"b", "c"})
+
+
+class PartyReviewEarlyAbortTest(unittest.TestCase):
+
+    def _review(self, early_abort):
+        orchestrator = ContractAmendmentOrchestrator()
+        finished, cancelled = [], []
+
+        async def rejecting(state):
+            return {"organization": "A", "decision": "rejected"}
+
+        async def slow(state):
+            try:
+                await asyncio.sleep(0.2)
+            except asyncio.CancelledError:
+                cancelled.append("party-b")
+                raise
+            finished.append("party-b")
+            return {"organization": "B", "decision": "approved"}
+
+        orchestrator.party_agents = {"party-a": rejecting, "party-b": slow}
+        state = AmendmentWorkflowState(
+            contract_id="contract-1",
+            parties=["party-a", "party-b"],
+            workflow_config={"early_abort_on_rejection": early_abort},
+        )
+        asyncio.run(orchestrator._party_review_node(state))
+        return finished, cancelled
+
+    def test_rejection_cancels_outstanding_reviews(self):
+        finished, cancelled = self._review(early_abort=True)
+
+        self.assertEqual(cancelled, ["party-b"])
+        self.assertEqual(finished, [])
+
+    def test_reviews_run_to_completion_without_early_abort(self):
+        finished, cancelled = self._review(early_abort=False)
+
+        self.assertEqual(cancelled, [])
+        self.assertEqual(finished, ["party-b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# backend/tests/test_party_node.py
+import unittest
+
+from backend.app.core.graph_state import AmendmentWorkflowState
+from backend.app.core.nodes.party_node import PartyAgentNode
+
+
+class FastRejectTest(unittest.TestCase):
+
+    def setUp(self):
+        self.node = PartyAgentNode(
+            "party-a", "Acme", {"prohibited_clauses": ["Exclusivity"], "budget_limit": 10000}
+        )
+
+    def _fast_reject(self, proposed_changes):
+        state = AmendmentWorkflowState(
+            contract_id="contract-1", parties=["party-a"], proposed_changes=proposed_changes
+        )
+        return self.node._fast_reject(state)
+
+    def test_prohibited_clause_key_is_rejected(self):
+        result = self._fast_reject({"exclusivity": "Supplier is exclusive"})
+
+        self.assertEqual(result["recommendation"], "rejected")
+        self.assertIn("Exclusivity", result["comments"])
+
+    def test_prohibited_clause_id_is_rejected(self):
+        result = self._fast_reject({"section_7": {"clause_id": "EXCLUSIVITY", "text": "..."}})
+
+        self.assertEqual(result["recommendation"], "rejected")
+
+    def test_amount_over_budget_is_rejected(self):
+        result = self._fast_reject({"fees": {"amount": 20000}})
+
+        self.assertEqual(result["recommendation"], "rejected")
+        self.assertIn("budget limit of 10000", result["comments"])
+
+    def test_amount_within_budget_needs_full_evaluation(self):
+        self.assertIsNone(self._fast_reject({"fees": {"amount": 10000}}))
+
+    def test_prohibited_clause_mentioned_in_text_needs_full_evaluation(self):
+        self.assertIsNone(self._fast_reject({"termination": "Remove the exclusivity clause"}))
+
+
+if __name__ == "__main__":
+    unittest.main()